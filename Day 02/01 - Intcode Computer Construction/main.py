@@ -1,39 +1,25 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import sys
 from pathlib import Path
 
+# Make the shared `intcode` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from intcode import Machine, parse_program  # noqa: E402
+
 INPUT_PATH = Path(__file__).parent / "input.txt"
 
 # Read input
-with INPUT_PATH.open("r") as input_fp:
-    code = [int(i.strip()) for i in input_fp.readline().split(",")]
+code = parse_program(INPUT_PATH)
 
 # Initiate code with 2 inputs
-code[1] = 12
-code[2] = 2
-
-pointer = 0
-
-while True:
-    action = code[pointer]
-    # End program if action code is `99`
-    if action == 99:
-        break
-    # Read 2 inputs
-    a = code[code[pointer + 1]]
-    b = code[code[pointer + 2]]
-    # Do the respective calculation
-    if action == 1:
-        c = a + b
-    elif action == 2:
-        c = a * b
-    else:
-        raise ValueError()
-    # Write output back
-    code[code[pointer + 3]] = c
-    # Increment pointer
-    pointer += 4
+machine = Machine(code)
+machine.memory[1] = 12
+machine.memory[2] = 2
+
+machine.run()
 
 # Print output
-print(code[0])
+print(machine.memory[0])
@@ -4,44 +4,22 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
-INPUT_PATH = Path(__file__).parent / "input.txt"
+# Make the shared `intcode` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-TARGET = 19690720
+from intcode import parse_program, solve  # noqa: E402
 
-# Read input
-with INPUT_PATH.open("r") as input_fp:
-    code_orig = [int(i.strip()) for i in input_fp.readline().split(",")]
+INPUT_PATH = Path(__file__).parent / "input.txt"
 
-# Brute-force through 0-99 for each input
-for i in range(100):
-    for j in range(100):
-        # Copy and initiate code
-        code = code_orig[:]
-        code[1] = i
-        code[2] = j
-        pointer = 0
+TARGET = 19690720
 
-        while True:
-            action = code[pointer]
-            # End program if action code is `99`
-            if action == 99:
-                break
-            # Read 2 inputs
-            a = code[code[pointer + 1]]
-            b = code[code[pointer + 2]]
-            # Do the respective calculation
-            if action == 1:
-                c = a + b
-            elif action == 2:
-                c = a * b
-            else:
-                raise ValueError()
-            # Write output back
-            code[code[pointer + 3]] = c
-            # Increment pointer
-            pointer += 4
+if __name__ == "__main__":
+    # Read input
+    code_orig = parse_program(INPUT_PATH)
 
-        if code[0] == TARGET:
-            # Found it. Print output and quit
-            print(100 * i + j)
-            sys.exit(0)
+    # Solve for 0-99 for each input. `code[0]` is affine in both, so this needs a
+    #   single symbolic run instead of brute-forcing through all of them
+    for solution in solve(code_orig, {1: range(100), 2: range(100)}, (0, TARGET)):
+        # Found it. Print output and quit
+        print(100 * solution[1] + solution[2])
+        break
@@ -1,28 +1,19 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
-LOWER = 254032
-UPPER = 789860
+import sys
+from pathlib import Path
 
-count = 0
+# Make the shared `passwords` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-# Brute-force through the numbers
-for n in range(LOWER, UPPER + 1):
-    ns = str(n)
-    double = False
+from passwords import count_passwords  # noqa: E402
 
-    for i in range(len(ns) - 1):
-        # Next character is smaller than this one; this number is invalid
-        if ns[i] > ns[i + 1]:
-            break
-        # Next character is same as this one; mark number as double
-        elif ns[i] == ns[i + 1]:
-            double = True
+LOWER = 254032
+UPPER = 789860
 
-    else:
-        # Add to `count` only if both are satisfactory
-        if double:
-            count += 1
+# Count the numbers digit by digit instead of going through them
+count = count_passwords(LOWER, UPPER)
 
 # Print output
 print(count)
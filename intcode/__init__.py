@@ -0,0 +1,68 @@
+"""
+Shared IntCode computer used by the IntCode puzzles (Days 02, 05, 07, 09, 11)
+"""
+
+from .amplifiers import amplifier_network, amplify_all
+from .decode import Instruction, StaticInstruction, decode, decode_static
+from .disasm import BasicBlock, ControlFlowGraph, build_cfg
+from .image import Image, cache_program, cached_image, load_program, write_image
+from .jit import Block, compile_block
+from .machine import Machine, Snapshot
+from .memo import Memoizer
+from .memory import Memory
+from .network import Channel, Deadlock, Network, NetworkStats, run_networks
+from .opcodes import OP_CODES, PARAM_TYPES, parse_op_code
+from .parse import parse_program
+from .profile import Profile
+from .scheduler import MachineStats, Scheduler
+from .shard import ShardResult, run_sharded
+from .sweep import SweepResult, sweep
+from .symbolic import NotSymbolic, Poly, solve, symbolic_run
+from .trace import Checkpoint, Recorder, Trace, record
+
+__all__ = [
+    "amplifier_network",
+    "amplify_all",
+    "Instruction",
+    "StaticInstruction",
+    "decode",
+    "decode_static",
+    "BasicBlock",
+    "ControlFlowGraph",
+    "build_cfg",
+    "Image",
+    "cache_program",
+    "cached_image",
+    "load_program",
+    "write_image",
+    "Block",
+    "compile_block",
+    "Machine",
+    "Snapshot",
+    "Memoizer",
+    "Memory",
+    "Channel",
+    "Deadlock",
+    "Network",
+    "NetworkStats",
+    "run_networks",
+    "OP_CODES",
+    "PARAM_TYPES",
+    "parse_op_code",
+    "parse_program",
+    "Profile",
+    "MachineStats",
+    "Scheduler",
+    "ShardResult",
+    "run_sharded",
+    "SweepResult",
+    "sweep",
+    "NotSymbolic",
+    "Poly",
+    "solve",
+    "symbolic_run",
+    "Checkpoint",
+    "Recorder",
+    "Trace",
+    "record",
+]
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from .machine import Machine, Snapshot
+from .memory import Memory
+from .network import Network
+
+
+def _prime(codes: Sequence[int], phases: Sequence[int]) -> Dict[int, Snapshot]:
+    """
+    Run the setup prefix of an amplifier once per phase setting: up to the point
+      where it waits for its input signal
+
+    Args:
+        codes  (Sequence[int]): Amplifier controller software
+        phases (Sequence[int]): Phase settings
+
+    Returns:
+        (dict[int, Snapshot]): State of the amplifier waiting for its input signal,
+                               by phase setting
+    """
+    memory = Memory(codes)
+    primed: Dict[int, Snapshot] = {}
+    for phase in phases:
+        amp = Machine(memory, [phase])
+        amp.run()
+        primed[phase] = amp.snapshot()
+    return primed
+
+
+def _pass_signal(amp: Machine, signal: int) -> int:
+    """
+    Send a signal through an amplifier
+
+    Args:
+        amp    (Machine): Amplifier
+        signal (int)    : Input signal
+
+    Returns:
+        (int): Output signal
+    """
+    amp.feed_input(signal)
+    amp.run()
+    return amp.drain_output()[-1]
+
+
+def amplify_all(
+    codes: Sequence[int],
+    phases: Sequence[int],
+    *,
+    feedback: bool = False,
+    signal: int = 0,
+) -> Iterator[Tuple[Tuple[int, ...], int]]:
+    """
+    Get the thruster signal of every ordering of the phase settings
+    The orderings are walked depth-first, so the first pass through amplifiers of a
+      shared prefix of phase settings is only run once, and each amplifier starts
+      from a fork of its phase setting's setup state instead of from scratch
+
+    Args:
+        codes    (Sequence[int]): Amplifier controller software
+        phases   (Sequence[int]): Phase settings, one per amplifier
+        feedback (bool)         : Whether the last amplifier feeds back into the
+                                  first one until it halts
+        signal   (int)          : Input signal of the first amplifier
+
+    Yields:
+        (tuple[int, ...]): Phase setting of each amplifier
+        (int)            : Thruster signal
+    """
+    primed = _prime(codes, phases)
+
+    def walk(
+        prefix: Tuple[int, ...], amps: List[Machine], signal: int
+    ) -> Iterator[Tuple[Tuple[int, ...], int]]:
+        remaining = [phase for phase in phases if phase not in prefix]
+        if not remaining:
+            if feedback:
+                # Siblings share the amplifiers of the prefix, so loop on forks of
+                #   them; the last one is not shared
+                amps = [amp.fork() for amp in amps[:-1]] + amps[-1:]
+                while not amps[-1].halted:
+                    for amp in amps:
+                        signal = _pass_signal(amp, signal)
+            yield prefix, signal
+            return
+        for phase in remaining:
+            amp = Machine.from_snapshot(primed[phase])
+            yield from walk(prefix + (phase,), amps + [amp], _pass_signal(amp, signal))
+
+    yield from walk((), [], signal)
+
+
+def amplifier_network(
+    codes: Sequence[int],
+    phases: Sequence[int],
+    *,
+    feedback: bool = False,
+    signal: int = 0,
+    maxsize: int = 1,
+) -> Network:
+    """
+    Build the network of amplifiers for one ordering of the phase settings
+    The amplifiers are named "A", "B", ... and the last one is tapped, so the
+      thruster signal is the last value of `network.taps[name]`
+
+    Args:
+        codes    (Sequence[int]): Amplifier controller software
+        phases   (Sequence[int]): Phase setting of each amplifier
+        feedback (bool)         : Whether the last amplifier feeds back into the
+                                  first one
+        signal   (int)          : Input signal of the first amplifier
+        maxsize  (int)          : Capacity of the channels between amplifiers
+
+    Returns:
+        (Network): Amplifier network, not run yet
+    """
+    memory = Memory(codes)
+    network = Network(maxsize)
+    names = [chr(ord("A") + i) for i in range(len(phases))]
+    for name, phase in zip(names, phases):
+        network.add(name, Machine(memory, [phase]))
+    network.machines[names[0]].feed_input(signal)
+    for source, destination in zip(names, names[1:]):
+        network.connect(source, destination)
+    if feedback:
+        network.connect(names[-1], names[0])
+    network.tap(names[-1])
+    return network
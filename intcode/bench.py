@@ -0,0 +1,94 @@
+"""
+Benchmark the IntCode machine against the original if/elif interpreter
+
+Usage:
+    python -m intcode.bench [PROGRAM] [-i INPUT ...] [-r REPEAT]
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, List, Sequence
+
+from .machine import Machine
+from .parse import parse_program
+from .paths import DAY_09_PATH
+from .reference import run_reference
+
+def count_instructions(codes: Sequence[int], inputs: Sequence[int]) -> int:
+    """
+    Count the instructions executed by a run of the program
+
+    Args:
+        codes  (Sequence[int]): Program codes
+        inputs (Sequence[int]): Input values, in order
+
+    Returns:
+        (int): Number of instructions executed
+    """
+    machine = Machine(codes, inputs)
+    count = 0
+    while machine.step():
+        count += 1
+    # Op 99 is executed too, though `step` reports the halt
+    return count + machine.halted
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    """
+    Time a function, keeping the best of a few runs
+
+    Args:
+        func   (() -> Any): Function to time
+        repeat (int)      : Number of runs
+
+    Returns:
+        (float): Best wall time, in seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def _run_machine(
+    codes: Sequence[int], inputs: Sequence[int], jit: bool = False
+) -> List[int]:
+    machine = Machine(codes, inputs, jit)
+    machine.run()
+    return machine.drain_output()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("program", nargs="?", type=Path, default=DAY_09_PATH)
+    parser.add_argument("-i", "--input", type=int, nargs="*", default=[2])
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    codes = parse_program(args.program)
+    inputs: List[int] = args.input
+    expected = run_reference(codes, inputs)
+    if _run_machine(codes, inputs) != expected:
+        raise ValueError("Machine and reference interpreter disagree")
+    if _run_machine(codes, inputs, jit=True) != expected:
+        raise ValueError("Compiled blocks and reference interpreter disagree")
+    count = count_instructions(codes, inputs)
+
+    print(f"{count} instructions")
+    baseline = best_time(lambda: run_reference(codes, inputs), args.repeat)
+    print(f"if/elif chain  : {count / baseline:>12,.0f} instructions/s")
+    current = best_time(lambda: _run_machine(codes, inputs), args.repeat)
+    print(f"dispatch table : {count / current:>12,.0f} instructions/s")
+    print(f"speedup        : {baseline / current:.1f}x")
+    compiled = best_time(lambda: _run_machine(codes, inputs, jit=True), args.repeat)
+    print(f"compiled blocks: {count / compiled:>12,.0f} instructions/s")
+    print(f"speedup        : {baseline / compiled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
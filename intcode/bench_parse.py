@@ -0,0 +1,98 @@
+"""
+Benchmark the program parser against the comma-split list comprehension
+
+Usage:
+    python -m intcode.bench_parse [-n CELLS] [-r REPEAT]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List
+
+from .bench import best_time
+from .parse import numpy, parse_program
+
+
+def write_program_text(path: Path, cells: int, seed: int = 0) -> None:
+    """
+    Write a random comma-separated program, with values of the sizes found in real
+      programs: mostly opcodes and small operands, some large constants
+
+    Args:
+        path  (Path): Path of the file
+        cells (int) : Number of values
+        seed  (int) : Random seed
+    """
+    rng = random.Random(seed)
+    sizes = [10, 1_000, 100_000, 1 << 40]
+    values = (rng.randrange(-size, size) for size in rng.choices(sizes, k=cells))
+    with path.open("w") as output_fp:
+        output_fp.write(",".join(map(str, values)))
+        output_fp.write("\n")
+
+
+def _comprehension(path: Path) -> List[int]:
+    with path.open("r") as input_fp:
+        return [int(code.strip()) for code in input_fp.readline().split(",")]
+
+
+def peak_memory(func: Callable[[], object]) -> int:
+    """
+    Measure the peak memory allocated by a function, including its result
+
+    Args:
+        func (() -> Any): Function to measure
+
+    Returns:
+        (int): Peak allocated bytes
+    """
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--cells", type=int, default=10_000_000)
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "program.txt"
+        write_program_text(path, args.cells)
+        size = path.stat().st_size
+        parsers: Dict[str, Callable[[], Iterable[int]]] = {
+            "comprehension": lambda: _comprehension(path),
+            "chunked": lambda: parse_program(path, vectorized=False),
+        }
+        if numpy is not None:
+            parsers["vectorized"] = lambda: parse_program(path, vectorized=True)
+        else:
+            print("NumPy is not installed; skipping the vectorized parser")
+
+        expected = _comprehension(path)
+        for name, func in parsers.items():
+            if list(func()) != expected:
+                raise ValueError(f"{name} parser disagrees with the comprehension")
+        del expected
+
+        print(f"{args.cells:,} cells, {size / 1e6:,.1f} MB")
+        print("parser              cells/s       MB/s   peak memory")
+        for name, func in parsers.items():
+            seconds = best_time(func, args.repeat)
+            peak = peak_memory(func) / 1e6
+            rate = args.cells / seconds
+            throughput = size / seconds / 1e6
+            print(f"{name:<14} {rate:>12,.0f} {throughput:>10.1f} {peak:>10.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
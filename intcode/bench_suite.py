@@ -0,0 +1,328 @@
+"""
+Benchmark the IntCode machine on standard workloads of the puzzles, and gate
+  regressions against a baseline
+
+Store a report with `-o`, then pass it as the baseline of later runs with `-b`: the
+  run fails if the instructions/s of a workload drop by more than the threshold
+
+Usage:
+    python -m intcode.bench_suite [-w WORKLOAD ...] [-m MODE ...] [-r REPEAT]
+        [-o OUTPUT] [-b BASELINE] [-t THRESHOLD]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import platform
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from itertools import permutations
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from .machine import Machine
+from .memo import Memoizer
+from .memory import Memory
+from .parse import parse_program
+from .paths import REPO_PATH
+from .profile import Profile
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; peak RSS is not reported then
+    resource = None  # type: ignore
+
+# Makes a machine: (codes or memory, input values) -> machine
+Factory = Callable[..., Machine]
+
+# Runs a workload with machines made by a factory, and returns its answer
+Workload = Callable[[Factory], object]
+
+
+def _program(day: str) -> Memory:
+    """
+    Load the program of a puzzle
+
+    Args:
+        day (str): Directory of the puzzle, relative to the repository
+
+    Returns:
+        (Memory): Program image
+    """
+    return Memory(parse_program(REPO_PATH / day / "input.txt"))
+
+
+def _day_02(make: Factory) -> object:
+    """
+    Run the gravity assist program for every noun and verb
+    """
+    memory = _program("Day 02/01 - Intcode Computer Construction")
+    results = []
+    for noun in range(100):
+        for verb in range(100):
+            machine = make(memory)
+            machine.memory[1] = noun
+            machine.memory[2] = verb
+            machine.run()
+            results.append(machine.memory[0])
+    return results.index(19690720)
+
+
+def _day_05(make: Factory) -> object:
+    """
+    Run the diagnostics of both systems; 100 times over, as a single run is too
+      short to time
+    """
+    memory = _program("Day 05/01 - Sunny with a Chance of Asteroids")
+    answers = []
+    for _ in range(100):
+        answers.clear()
+        for system in (1, 5):
+            machine = make(memory, [system])
+            machine.run()
+            answers.append(machine.drain_output()[-1])
+    return answers
+
+
+def _day_07(make: Factory) -> object:
+    """
+    Run the amplifiers for every ordering of the phase settings, in series and in a
+      feedback loop
+    """
+    memory = _program("Day 07/01 - Amplification Circuit")
+    answers = []
+    for phases in (range(5), range(5, 10)):
+        best = 0
+        for ordering in permutations(phases):
+            amps = [make(memory, [phase]) for phase in ordering]
+            signal = 0
+            while not amps[-1].halted:
+                for amp in amps:
+                    amp.feed_input(signal)
+                    amp.run()
+                    signal = amp.drain_output()[-1]
+            best = max(best, signal)
+        answers.append(best)
+    return answers
+
+
+def _day_09(make: Factory) -> object:
+    """
+    Run the BOOST program in test and sensor boost modes
+    """
+    memory = _program("Day 09/01 - Sensor Boost")
+    answers = []
+    for mode in (1, 2):
+        machine = make(memory, [mode])
+        machine.run()
+        answers.append(machine.drain_output()[-1])
+    return answers
+
+
+def _day_11(make: Factory) -> object:
+    """
+    Run the hull painting robot from a black and from a white panel
+    """
+    memory = _program("Day 11/01 - Space Police")
+    answers = []
+    for start in (0, 1):
+        bot = make(memory)
+        board = {0j: start}
+        position = 0j
+        direction = 1 + 0j
+        while True:
+            bot.feed_input(board.get(position, 0))
+            board[position], turn = bot.run(until="input_needed")
+            direction *= 1j if turn == 0 else -1j
+            position += direction
+            if bot.halted:
+                break
+        answers.append(len(board))
+    return answers
+
+
+WORKLOADS: Dict[str, Workload] = {
+    "day02_sweep": _day_02,
+    "day05_diagnostics": _day_05,
+    "day07_permutations": _day_07,
+    "day09_boost": _day_09,
+    "day11_robot": _day_11,
+}
+
+MODES: Dict[str, Factory] = {
+    "dispatch": Machine,
+    "jit": lambda codes, inputs=(): Machine(codes, inputs, jit=True),
+    "memo": lambda codes, inputs=(): Machine(codes, inputs, memo=Memoizer()),
+}
+
+
+def count_instructions(workload: str) -> int:
+    """
+    Count the instructions executed by a workload; they do not depend on the mode.
+      Calls skipped by memoization count too, so its rate is an effective one
+
+    Args:
+        workload (str): Name of the workload
+
+    Returns:
+        (int): Number of instructions executed
+    """
+    profile = Profile()
+    WORKLOADS[workload](
+        lambda codes, inputs=(): Machine(codes, inputs, profile=profile)
+    )
+    return profile.instructions
+
+
+def _measure(workload: str, mode: str, repeat: int) -> Dict[str, Any]:
+    """
+    Time a workload in the current process, which should be fresh so that its peak
+      RSS is that of the workload
+
+    Args:
+        workload (str): Name of the workload
+        mode     (str): Name of the mode
+        repeat   (int): Number of runs, the best of which is kept
+
+    Returns:
+        (dict[str, Any]): Best wall time, answer and peak RSS
+    """
+    seconds = float("inf")
+    answer: object = None
+    for _ in range(repeat):
+        start = perf_counter()
+        answer = WORKLOADS[workload](MODES[mode])
+        seconds = min(seconds, perf_counter() - start)
+    peak_rss: Optional[int] = None
+    if resource is not None:
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        if sys.platform != "darwin":
+            peak_rss *= 1024
+    return {"seconds": seconds, "answer": repr(answer), "peak_rss": peak_rss}
+
+
+def run_suite(
+    workloads: Iterable[str], modes: Iterable[str], repeat: int = 3
+) -> Dict[str, Any]:
+    """
+    Benchmark workloads in every mode, each in a fresh process
+
+    Args:
+        workloads (Iterable[str]): Names of the workloads
+        modes     (Iterable[str]): Names of the modes
+        repeat    (int)          : Number of runs, the best of which is kept
+
+    Returns:
+        (dict[str, Any]): Report: environment, and results keyed by
+                          "workload/mode"
+    """
+    modes = list(modes)
+    context = multiprocessing.get_context("spawn")
+    results: Dict[str, Dict[str, Any]] = {}
+    for workload in workloads:
+        instructions = count_instructions(workload)
+        answers: Set[str] = set()
+        for mode in modes:
+            with ProcessPoolExecutor(1, mp_context=context) as pool:
+                result = pool.submit(_measure, workload, mode, repeat).result()
+            result["instructions"] = instructions
+            result["instructions_per_second"] = instructions / result["seconds"]
+            results[f"{workload}/{mode}"] = result
+            answers.add(result["answer"])
+        if len(answers) > 1:
+            raise ValueError(f"Modes disagree on {workload}: {sorted(answers)}")
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def regressions(
+    report: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """
+    Compare a report with a baseline
+
+    Args:
+        report    (dict[str, Any]): Report of `run_suite`
+        baseline  (dict[str, Any]): Earlier report
+        threshold (float)         : Largest allowed drop of instructions/s, as a
+                                    fraction of the baseline
+
+    Returns:
+        (list[str]): Descriptions of the results that regressed past the threshold
+    """
+    found: List[str] = []
+    for key, result in report["results"].items():
+        before = baseline["results"].get(key)
+        if before is None:
+            continue
+        rate = result["instructions_per_second"]
+        floor = before["instructions_per_second"] * (1 - threshold)
+        if rate < floor:
+            change = rate / before["instructions_per_second"] - 1
+            found.append(f"{key}: {rate:,.0f} instructions/s ({change:+.1%})")
+    return found
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """
+    Format a report as a table
+
+    Args:
+        report (dict[str, Any]): Report of `run_suite`
+
+    Returns:
+        (str): Table
+    """
+    lines = [
+        "workload/mode                  instructions   wall time      instr/s  peak RSS"
+    ]
+    for key, result in report["results"].items():
+        peak_rss = result["peak_rss"]
+        rss = f"{peak_rss / 2 ** 20:>6.1f} MB" if peak_rss is not None else "     n/a"
+        lines.append(
+            f"{key:<30} {result['instructions']:>12,} {result['seconds']:>9.4f} s"
+            f" {result['instructions_per_second']:>12,.0f} {rss}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "-w", "--workload", nargs="*", choices=WORKLOADS, default=list(WORKLOADS)
+    )
+    parser.add_argument(
+        "-m", "--mode", nargs="*", choices=MODES, default=["dispatch", "jit"]
+    )
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    parser.add_argument("-o", "--output", type=Path, default=None)
+    parser.add_argument("-b", "--baseline", type=Path, default=None)
+    parser.add_argument("-t", "--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    report = run_suite(args.workload, args.mode, args.repeat)
+    print(format_report(report))
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())
+        found = regressions(report, baseline, args.threshold)
+        for regression in found:
+            print(f"REGRESSION {regression}")
+        if found:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
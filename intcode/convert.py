@@ -0,0 +1,30 @@
+"""
+Convert a comma-separated IntCode program to a binary image
+
+Usage:
+    python -m intcode.convert PROGRAM [-o IMAGE]
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from .image import SUFFIX, write_image
+from .parse import parse_program
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("program", type=Path)
+    parser.add_argument("-o", "--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    codes = parse_program(args.program)
+    output: Path = args.output or args.program.with_suffix(SUFFIX)
+    write_image(codes, output)
+    print(f"{len(codes)} cells written to {output}")
+
+
+if __name__ == "__main__":
+    main()
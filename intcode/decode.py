@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple, NoReturn, Tuple
+
+from .dispatch import DISPATCH, MAX_OP_CODE, MODULI, Handler
+from .opcodes import OP_CODES, PARAM_TYPES, parse_op_code
+
+if TYPE_CHECKING:
+    from .memory import Memory
+
+
+class Instruction(NamedTuple):
+    """
+    A decoded instruction
+
+    Properties:
+        handler (Handler): Handler specialized for the operation and parameter types
+        a, b, c (int*3)  : Raw parameters 1-3; 0 if unused
+        length  (int)    : Number of cells the instruction occupies
+    """
+
+    handler: Handler
+    a: int
+    b: int
+    c: int
+    length: int
+
+
+def decode(memory: Memory, pointer: int) -> Instruction:
+    """
+    Decode the instruction at `pointer`
+
+    Args:
+        memory  (Memory): Memory of the machine
+        pointer (int)   : Address of the instruction
+
+    Returns:
+        (Instruction): Decoded instruction
+    """
+    op_code = memory[pointer] % 100000
+    op_code %= MODULI[op_code % 100]
+    entry = DISPATCH[op_code] if op_code <= MAX_OP_CODE else None
+    if entry is None:
+        _raise_invalid(op_code)
+    handler, length = entry
+    a, b, c = (memory[pointer + i] if i < length else 0 for i in range(1, 4))
+    return Instruction(handler, a, b, c, length)
+
+
+def fetch(memory: Memory, pointer: int) -> Instruction:
+    """
+    Get the decoded instruction at `pointer`, decoding it if necessary
+    A newly decoded instruction is also cached in the memory `memory` was copied
+      from, if that one holds the same cells
+
+    Args:
+        memory  (Memory): Memory of the machine
+        pointer (int)   : Address of the instruction
+
+    Returns:
+        (Instruction): Decoded instruction
+    """
+    try:
+        return memory.decoded[pointer]
+    except KeyError:
+        pass
+    instruction = decode(memory, pointer)
+    cells = range(pointer, pointer + instruction.length)
+    memory.decoded[pointer] = instruction
+    memory.code.update(cells)
+    # Share the instruction with the memory this one was copied from, so that its
+    #   other copies do not decode it again
+    origin = memory.origin
+    if origin is not None and all(origin[cell] == memory[cell] for cell in cells):
+        origin.decoded[pointer] = instruction
+        origin.code.update(cells)
+    return instruction
+
+
+class StaticInstruction(NamedTuple):
+    """
+    An instruction with its operands as they are in memory
+
+    Properties:
+        address     (int)            : Address of the instruction
+        op          (int)            : Operation (OP_CODES)
+        param_types (tuple[int, ...]): Types of the parameters used (PARAM_TYPES)
+        params      (tuple[int, ...]): Raw parameters used
+        length      (int)            : Number of cells the instruction occupies
+    """
+
+    address: int
+    op: int
+    param_types: Tuple[int, ...]
+    params: Tuple[int, ...]
+    length: int
+
+
+def decode_static(memory: Memory, pointer: int) -> StaticInstruction:
+    """
+    Decode the instruction at `pointer` into its operation and operands
+    The instruction is also decoded for execution, and cached like with `fetch`
+
+    Args:
+        memory  (Memory): Memory of the machine
+        pointer (int)   : Address of the instruction
+
+    Returns:
+        (StaticInstruction): Decoded instruction
+    """
+    length = fetch(memory, pointer).length
+    op, *param_types = parse_op_code(memory[pointer])
+    params = tuple(memory[pointer + i] for i in range(1, length))
+    return StaticInstruction(
+        pointer, op, tuple(param_types[: length - 1]), params, length
+    )
+
+
+def _raise_invalid(op_code: int) -> NoReturn:
+    """
+    Raise the error explaining why an opcode is invalid
+
+    Args:
+        op_code (int): Operation code, with the type digits of unused parameters
+                       set to 0
+    """
+    op, *param_types = parse_op_code(op_code)
+    if op not in OP_CODES.__members__.values():
+        raise ValueError(f"{op=} unknown operation")
+    for param_type in param_types:
+        if param_type not in PARAM_TYPES.__members__.values():
+            raise ValueError(f"{param_type=} unknown param type")
+    raise ValueError(f"{op_code=} writes to a {PARAM_TYPES.VALUE.name} param")
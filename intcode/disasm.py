@@ -0,0 +1,388 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Set, Tuple, Union
+
+from .decode import StaticInstruction, decode_static
+from .jit import compile_block
+from .memory import Memory
+from .opcodes import OP_CODES, PARAM_TYPES
+
+# Operation -> index of the parameter it writes to
+_WRITES = {
+    OP_CODES.ADD: 2,
+    OP_CODES.MUL: 2,
+    OP_CODES.INPUT: 0,
+    OP_CODES.LESS_THAN: 2,
+    OP_CODES.EQUAL: 2,
+}
+
+# Operations that may jump
+_JUMPS = {OP_CODES.JUMP_TRUE, OP_CODES.JUMP_FALSE}
+
+# Kinds of edges between blocks
+JUMP = "jump"
+FALLTHROUGH = "fallthrough"
+
+
+class BasicBlock(NamedTuple):
+    """
+    Straight-line run of instructions, only entered at its first one
+
+    Properties:
+        start        (int)                    : Address of the first instruction
+        end          (int)                    : Address right after the last
+                                                instruction
+        instructions (list[StaticInstruction]): Instructions, in order
+        successors   (list[tuple[int, str]])  : Start of each block executed next,
+                                                with the kind of edge (`JUMP` or
+                                                `FALLTHROUGH`)
+        indirect     (bool)                   : Whether the block ends with a jump
+                                                whose target is only known at run
+                                                time
+    """
+
+    start: int
+    end: int
+    instructions: List[StaticInstruction]
+    successors: List[Tuple[int, str]]
+    indirect: bool
+
+
+class ControlFlowGraph:
+    """
+    Control-flow graph of the code reachable from some entry points
+    Code only reachable through indirect jumps is not found, unless its address is
+      given as an entry point
+
+    Args:
+        memory (Memory)       : Memory holding the program; its instructions are
+                                decoded for execution on the way
+        entries (Iterable[int]): Addresses execution may start from
+
+    Public Properties:
+        memory         (Memory)                      : Memory holding the program
+        entries        (list[int])                   : Addresses execution may start
+                                                       from
+        instructions   (dict[int, StaticInstruction]): Reachable instructions, by
+                                                       address
+        blocks         (dict[int, BasicBlock])       : Basic blocks, by start address
+        invalid        (dict[int, str])              : Reachable addresses that do not
+                                                       decode, with the error
+        indirect       (set[int])                    : Addresses of the jumps whose
+                                                       target is only known at run
+                                                       time
+        self_modifying (dict[int, int])              : Addresses of the instructions
+                                                       writing to a cell of an
+                                                       instruction, with the address
+                                                       of that cell
+    """
+
+    def __init__(self, memory: Memory, entries: Iterable[int] = (0,)) -> None:
+        self.memory = memory
+        self.entries = list(entries)
+        self.instructions: Dict[int, StaticInstruction] = {}
+        self.blocks: Dict[int, BasicBlock] = {}
+        self.invalid: Dict[int, str] = {}
+        self.indirect: Set[int] = set()
+        self.self_modifying: Dict[int, int] = {}
+        # Static targets of each jump, with whether it may fall through
+        self._jumps: Dict[int, Tuple[List[int], bool]] = {}
+        leaders = self._explore()
+        self._split(leaders)
+        self._find_self_modifying()
+
+    def _explore(self) -> Set[int]:
+        """
+        Decode every instruction reachable from the entry points
+
+        Returns:
+            (set[int]): Addresses starting a basic block
+        """
+        leaders = set(self.entries)
+        pending = list(self.entries)
+        while pending:
+            address = pending.pop()
+            while address not in self.instructions and address not in self.invalid:
+                try:
+                    instruction = decode_static(self.memory, address)
+                except (ValueError, IndexError) as error:
+                    self.invalid[address] = str(error)
+                    break
+                self.instructions[address] = instruction
+                next_address = address + instruction.length
+                if instruction.op == OP_CODES.END:
+                    break
+                if instruction.op in _JUMPS:
+                    targets, falls = self._jump_targets(instruction)
+                    self._jumps[address] = (targets, falls)
+                    if falls:
+                        targets = targets + [next_address]
+                    leaders.update(targets)
+                    pending += targets
+                    break
+                address = next_address
+            else:
+                # Joined code that was already explored
+                leaders.add(address)
+        return leaders
+
+    def _jump_targets(self, instruction: StaticInstruction) -> Tuple[List[int], bool]:
+        """
+        Find where a jump may go
+
+        Args:
+            instruction (StaticInstruction): Jump instruction
+
+        Returns:
+            (list[int]): Static targets of the jump, if it may be taken
+            (bool)     : Whether it may fall through
+        """
+        (condition_type, target_type), (condition, target) = (
+            instruction.param_types,
+            instruction.params,
+        )
+        taken = falls = True
+        if condition_type == PARAM_TYPES.VALUE:
+            taken = bool(condition) == (instruction.op == OP_CODES.JUMP_TRUE)
+            falls = not taken
+        if not taken:
+            return [], falls
+        if target_type == PARAM_TYPES.VALUE:
+            return [target], falls
+        self.indirect.add(instruction.address)
+        return [], falls
+
+    def _split(self, leaders: Set[int]) -> None:
+        """
+        Group the instructions into basic blocks
+
+        Args:
+            leaders (set[int]): Addresses starting a basic block
+        """
+        for start in sorted(leaders & self.instructions.keys()):
+            instructions: List[StaticInstruction] = []
+            successors: List[Tuple[int, str]] = []
+            address = start
+            while True:
+                instruction = self.instructions[address]
+                instructions.append(instruction)
+                address += instruction.length
+                if instruction.op == OP_CODES.END:
+                    break
+                if instruction.op in _JUMPS:
+                    targets, falls = self._jumps[instruction.address]
+                    successors += [(target, JUMP) for target in targets]
+                    if falls:
+                        successors.append((address, FALLTHROUGH))
+                    break
+                if address in leaders or address not in self.instructions:
+                    successors.append((address, FALLTHROUGH))
+                    break
+            self.blocks[start] = BasicBlock(
+                start,
+                address,
+                instructions,
+                successors,
+                instructions[-1].address in self.indirect,
+            )
+
+    def _find_self_modifying(self) -> None:
+        """
+        Find the writes to a fixed address that is part of an instruction, or that
+          does not decode yet
+        Writes to relative addresses are only known at run time, and not checked
+        """
+        code = set(self.invalid)
+        for instruction in self.instructions.values():
+            end = instruction.address + instruction.length
+            code.update(range(instruction.address, end))
+        for instruction in self.instructions.values():
+            index = _WRITES.get(instruction.op)
+            if index is None:
+                continue
+            if instruction.param_types[index] != PARAM_TYPES.POSITION:
+                continue
+            if instruction.params[index] in code:
+                self.self_modifying[instruction.address] = instruction.params[index]
+
+    def loop_headers(self) -> Set[int]:
+        """
+        Find the blocks that start a loop: the targets of the edges going back to a
+          block being visited, in a depth-first walk from the entry points
+
+        Returns:
+            (set[int]): Start addresses of the loop headers
+        """
+        headers: Set[int] = set()
+        visited: Set[int] = set()
+        for entry in self.entries:
+            if entry not in self.blocks or entry in visited:
+                continue
+            visited.add(entry)
+            on_path = {entry}
+            stack = [(entry, iter(self.blocks[entry].successors))]
+            while stack:
+                start, successors = stack[-1]
+                for successor, _ in successors:
+                    if successor in on_path:
+                        headers.add(successor)
+                    elif successor in self.blocks and successor not in visited:
+                        visited.add(successor)
+                        on_path.add(successor)
+                        successors = iter(self.blocks[successor].successors)
+                        stack.append((successor, successors))
+                        break
+                else:
+                    stack.pop()
+                    on_path.discard(start)
+        return headers
+
+    def predecode(self, memory: Memory) -> None:
+        """
+        Decode all the reachable instructions of a memory holding the same program,
+          so that execution does not have to
+
+        Args:
+            memory (Memory): Memory holding the program
+        """
+        for address in self.instructions:
+            decode_static(memory, address)
+
+    def precompile(self, memory: Memory) -> None:
+        """
+        Compile the blocks starting a loop in a memory holding the same program, so
+          that the JIT does not have to wait for them to get hot
+
+        Args:
+            memory (Memory): Memory holding the program
+        """
+        for start in self.loop_headers():
+            compile_block(memory, start)
+
+    def listing(self) -> str:
+        """
+        Format the program as a text listing, block by block
+
+        Returns:
+            (str): Listing
+        """
+        predecessors = self._predecessors()
+        lines: List[str] = []
+        for start, block in self.blocks.items():
+            sources = ", ".join(map(str, sorted(predecessors[start]))) or "-"
+            lines.append(f"block_{start}:  ; from {sources}")
+            for instruction in block.instructions:
+                lines.append(f"    {self._format(instruction)}")
+            targets = [f"{target} ({kind})" for target, kind in block.successors]
+            if block.indirect:
+                targets.append("? (indirect)")
+            lines.append(f"    ; to {', '.join(targets) or '-'}")
+            lines.append("")
+        for address, error in sorted(self.invalid.items()):
+            lines.append(f"invalid_{address}:  ; {error}")
+        return "\n".join(lines).rstrip() + "\n"
+
+    def dot(self) -> str:
+        """
+        Format the graph in the DOT language of Graphviz
+
+        Returns:
+            (str): DOT source
+        """
+        lines = [
+            "digraph intcode {",
+            '    node [shape=box, fontname="monospace"];',
+        ]
+        for start, block in self.blocks.items():
+            label = "".join(
+                f"{self._format(instruction)}\\l"
+                for instruction in block.instructions
+            ).replace('"', '\\"')
+            lines.append(f'    block_{start} [label="{label}"];')
+            for target, kind in block.successors:
+                node = "block" if target in self.blocks else "invalid"
+                style = "solid" if kind == JUMP else "dashed"
+                lines.append(f"    block_{start} -> {node}_{target} [style={style}];")
+            if block.indirect:
+                lines.append(f"    block_{start} -> indirect [style=dotted];")
+        if self.indirect:
+            lines.append('    indirect [shape=ellipse, label="?"];')
+        for address in sorted(self.invalid):
+            label = f"{address}: invalid"
+            lines.append(f'    invalid_{address} [shape=octagon, label="{label}"];')
+        lines.append("}")
+        return "\n".join(lines) + "\n"
+
+    def _predecessors(self) -> Dict[int, Set[int]]:
+        """
+        Get the blocks leading to each block
+
+        Returns:
+            (dict[int, set[int]]): Start addresses of the predecessors, by start
+                                   address
+        """
+        predecessors: Dict[int, Set[int]] = {start: set() for start in self.blocks}
+        for start, block in self.blocks.items():
+            for target, _ in block.successors:
+                if target in predecessors:
+                    predecessors[target].add(start)
+        return predecessors
+
+    def _format(self, instruction: StaticInstruction) -> str:
+        """
+        Format an instruction, with its marks
+
+        Args:
+            instruction (StaticInstruction): Instruction
+
+        Returns:
+            (str): One line of listing
+        """
+        operands = ", ".join(
+            _format_operand(param_type, param)
+            for param_type, param in zip(instruction.param_types, instruction.params)
+        )
+        name = OP_CODES(instruction.op).name
+        line = f"{instruction.address:>6}  {name:<15} {operands}"
+        if instruction.address in self.self_modifying:
+            target = self.self_modifying[instruction.address]
+            line += f"  ; self-modifying: writes code at {target}"
+        elif instruction.address in self.indirect:
+            line += "  ; indirect"
+        return line.rstrip()
+
+
+def _format_operand(param_type: int, param: int) -> str:
+    """
+    Format an operand: `n` for values, `[n]` for positions and `[rb+n]` for relative
+      positions
+
+    Args:
+        param_type (int): Parameter type (PARAM_TYPES)
+        param      (int): Raw parameter
+
+    Returns:
+        (str): Formatted operand
+    """
+    if param_type == PARAM_TYPES.VALUE:
+        return str(param)
+    if param_type == PARAM_TYPES.POSITION:
+        return f"[{param}]"
+    return f"[rb{param:+d}]"
+
+
+def build_cfg(
+    codes: Union[Sequence[int], Memory], entries: Iterable[int] = (0,)
+) -> ControlFlowGraph:
+    """
+    Build the control-flow graph of a program
+
+    Args:
+        codes   (Sequence[int] | Memory): Program codes, or memory holding them
+        entries (Iterable[int])         : Addresses execution may start from
+
+    Returns:
+        (ControlFlowGraph): Control-flow graph
+    """
+    memory = codes if isinstance(codes, Memory) else Memory(codes)
+    return ControlFlowGraph(memory, entries)
@@ -0,0 +1,30 @@
+"""
+Disassemble an IntCode program into a control-flow graph of basic blocks
+
+Usage:
+    python -m intcode.disassemble [PROGRAM] [-e ENTRY ...] [--dot]
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from .disasm import build_cfg
+from .parse import parse_program
+from .paths import DAY_09_PATH
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("program", nargs="?", type=Path, default=DAY_09_PATH)
+    parser.add_argument("-e", "--entry", type=int, nargs="*", default=[0])
+    parser.add_argument("--dot", action="store_true", help="output DOT instead")
+    args = parser.parse_args()
+
+    cfg = build_cfg(parse_program(args.program), args.entry)
+    print(cfg.dot() if args.dot else cfg.listing(), end="")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+from itertools import product
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .memory import BIG, INT64_MAX
+from .opcodes import OP_CODES, PARAM_TYPES
+
+if TYPE_CHECKING:
+    from .machine import Machine
+    from .memory import DenseCells, Memory
+
+# Executes an instruction and returns the new instruction pointer
+#   Args: machine, memory, dense image of the memory, pointer, raw parameters 1-3
+Handler = Callable[["Machine", "Memory", "DenseCells", int, int, int, int], int]
+
+# Largest opcode (without the ignored digits beyond ten thousand's place)
+MAX_OP_CODE = 22299
+
+
+class StopExecution(Exception):
+    """
+    Raised by handlers when the machine cannot continue: halted or blocked on input
+    """
+
+
+# Operation -> (parameter kinds, body), where a parameter kind is `True` if the
+#   parameter is written to and `False` if it is read. In the body, `{r1}` and `{r2}`
+#   are the values of parameters 1 and 2, and a line `{w1} = ...` or `{w3} = ...`
+#   stores a value to the target of parameter 1 or 3. Stored values are checked to
+#   fit in int64 unless the line is `{w3} = bool(...)`. `{pointer}` and `{rel_base}`
+#   are the instruction pointer and the relative base
+_TEMPLATES: Dict[int, Tuple[Tuple[bool, ...], str]] = {
+    # Addition: Gets 2 params, add, and save result to space pointed to by 3rd param
+    OP_CODES.ADD: (
+        (False, False, True),
+        "{w3} = {r1} + {r2}\n"
+        "return {pointer} + 4",
+    ),
+    # Multiplication: Gets 2 params, multiply, and save result to space pointed to by
+    #   3rd param
+    OP_CODES.MUL: (
+        (False, False, True),
+        "{w3} = {r1} * {r2}\n"
+        "return {pointer} + 4",
+    ),
+    # Input: Gets queued input and save result to space pointed to by 1st param.
+    #   Blocks (without consuming the instruction) if there is no input queued
+    OP_CODES.INPUT: (
+        (True,),
+        "if not m.inputs:\n"
+        "    raise StopExecution()\n"
+        "{w1} = m.inputs.popleft()\n"
+        "return {pointer} + 2",
+    ),
+    # Output: Gets 1 param and save to output
+    OP_CODES.OUTPUT: (
+        (False,),
+        "m.outputs.append({r1})\n"
+        "return {pointer} + 2",
+    ),
+    # Jump if True: Gets 2 params, check if the 1st is non-zero, and jump if true
+    OP_CODES.JUMP_TRUE: (
+        (False, False),
+        "return {r2} if {r1} else {pointer} + 3",
+    ),
+    # Jump if False: Gets 2 params, check if the 1st is zero, and jump if true
+    OP_CODES.JUMP_FALSE: (
+        (False, False),
+        "return {pointer} + 3 if {r1} else {r2}",
+    ),
+    # Less than: Gets 2 params, check if the 1st is less than the 2nd, and save result
+    #   to space pointed to by 3rd param
+    OP_CODES.LESS_THAN: (
+        (False, False, True),
+        "{w3} = bool({r1} < {r2})\n"
+        "return {pointer} + 4",
+    ),
+    # Equal: Gets 2 params, check if the 1st equals the 2nd, and save result to space
+    #   pointed to by 3rd param
+    OP_CODES.EQUAL: (
+        (False, False, True),
+        "{w3} = bool({r1} == {r2})\n"
+        "return {pointer} + 4",
+    ),
+    # Adjust relative base: Gets 1 param and add to `rel_base`
+    OP_CODES.ADJUST_REL_BASE: (
+        (False,),
+        "{rel_base} += {r1}\n"
+        "return {pointer} + 2",
+    ),
+    # End program
+    OP_CODES.END: (
+        (),
+        "m.halted = True\n"
+        "raise StopExecution()",
+    ),
+}
+
+
+def _address(
+    param_type: int, raw: str, name: str, rel_base: str
+) -> Tuple[List[str], str]:
+    """
+    Generate the source resolving a parameter to the address it points to, checked
+      to be non-negative where it is used, as the dense image would wrap around
+
+    Args:
+        param_type (int): Parameter type (PARAM_TYPES), not `PARAM_TYPES.VALUE`
+        raw        (str): Name of the raw parameter
+        name       (str): Name to give the address, if it has to be computed
+        rel_base   (str): Expression of the relative base
+
+    Returns:
+        (list[str]): Source lines computing the address
+        (str)      : Expression of the address
+    """
+    lines: List[str] = []
+    if param_type == PARAM_TYPES.POSITION:
+        # Operands compiled in as constants are checked right away
+        if raw.lstrip("-").isdigit():
+            if int(raw) >= 0:
+                return lines, raw
+            return [f'raise IndexError("Index cannot be negative; got {raw}")'], raw
+        name = raw
+    else:
+        lines.append(f"{name} = {rel_base} + {raw}")
+    return lines + [
+        f"if {name} < 0:",
+        f'    raise IndexError(f"Index cannot be negative; got {{{name}}}")',
+    ], name
+
+
+def _read(
+    param_type: int, raw: str, name: str, rel_base: str
+) -> Tuple[List[str], str]:
+    """
+    Generate the source reading a parameter value
+
+    Args:
+        param_type (int): Parameter type (PARAM_TYPES)
+        raw        (str): Name of the raw parameter
+        name       (str): Name to give the value, if it has to be computed
+        rel_base   (str): Expression of the relative base
+
+    Returns:
+        (list[str]): Source lines computing the value
+        (str)      : Expression of the value
+    """
+    if param_type == PARAM_TYPES.VALUE:
+        return [], raw
+    lines, address = _address(param_type, raw, f"{name}_address", rel_base)
+    return lines + [
+        # Addresses beyond the dense image are loaded from the sparse pages
+        "try:",
+        f"    {name} = dense[{address}]",
+        "except IndexError:",
+        f"    {name} = memory.load({address})",
+        f"if {name} == {BIG}:",
+        f"    {name} = memory.big[{address}]",
+    ], name
+
+
+def _write(
+    param_type: int,
+    raw: str,
+    name: str,
+    value: str,
+    rel_base: str,
+    on_invalidate: Sequence[str],
+) -> List[str]:
+    """
+    Generate the source storing a value to the target of a parameter
+
+    Args:
+        param_type    (int)          : Parameter type (PARAM_TYPES)
+        raw           (str)          : Name of the raw parameter
+        name          (str)          : Name to give the target address, if it has to
+                                       be computed
+        value         (str)          : Expression of the value; `bool(...)` if it is
+                                       known to fit in int64
+        rel_base      (str)          : Expression of the relative base
+        on_invalidate (Sequence[str]): Source lines to run after overwriting a
+                                       decoded instruction
+
+    Returns:
+        (list[str]): Source lines storing the value
+    """
+    # The value is computed first: op 3 takes its input before the target is checked
+    lines = [f"value = {value}"]
+    address_lines, address = _address(param_type, raw, name, rel_base)
+    lines += address_lines
+    store = [
+        # Addresses beyond the dense image are stored to the sparse pages
+        "try:",
+        f"    dense[{address}] = value",
+        "except IndexError:",
+        f"    memory.store({address}, value)",
+    ]
+    if value.startswith("bool("):
+        lines += store
+    else:
+        # Values that do not fit in int64 are stored to `memory.big`
+        lines += [
+            f"if {BIG} < value <= {INT64_MAX}:",
+            *(f"    {line}" for line in store),
+            "else:",
+            f"    memory.store({address}, value)",
+        ]
+    return lines + [
+        f"if {address} in memory.code:",
+        f"    memory.invalidate({address})",
+        *(f"    {line}" for line in on_invalidate),
+    ]
+
+
+def instruction_lines(
+    op: int,
+    param_types: Tuple[int, ...],
+    raws: Sequence[str] = "abc",
+    *,
+    pointer: str = "pointer",
+    rel_base: str = "m.rel_base",
+    on_invalidate: Sequence[str] = (),
+) -> Optional[List[str]]:
+    """
+    Generate the source executing an operation specialized for its parameter types
+    The source ends with a `return` of the new instruction pointer, or raises
+      `StopExecution`
+
+    Args:
+        op            (int)            : Operation (OP_CODES)
+        param_types   (tuple[int, ...]): Types of the parameters used (PARAM_TYPES)
+        raws          (Sequence[str])  : Expressions of the raw parameters 1-3
+        pointer       (str)            : Expression of the instruction pointer
+        rel_base      (str)            : Expression of the relative base; assigned to
+                                         by op 9
+        on_invalidate (Sequence[str])  : Source lines to run after overwriting a
+                                         decoded instruction
+
+    Returns:
+        (list[str]?): Source lines; `None` if a written parameter is of
+                      `PARAM_TYPES.VALUE` type
+    """
+    kinds, body = _TEMPLATES[op]
+    lines: List[str] = []
+    fields: Dict[str, str] = {"pointer": pointer, "rel_base": rel_base}
+    writes: Dict[str, Tuple[int, str]] = {}
+    for i, (is_write, param_type, raw) in enumerate(zip(kinds, param_types, raws), 1):
+        if is_write:
+            if param_type == PARAM_TYPES.VALUE:
+                return None
+            writes[f"{{w{i}}} = "] = (param_type, raw)
+        else:
+            read_lines, fields[f"r{i}"] = _read(
+                param_type, raw, f"param{i}", rel_base
+            )
+            lines += read_lines
+    for line in body.splitlines():
+        for prefix, (param_type, raw) in writes.items():
+            if line.startswith(prefix):
+                value = line[len(prefix) :].format(**fields)
+                lines += _write(
+                    param_type, raw, "address", value, rel_base, on_invalidate
+                )
+                break
+        else:
+            lines.append(line.format(**fields))
+    return lines
+
+
+def _make_handler(op: int, param_types: Tuple[int, ...]) -> Optional[Handler]:
+    """
+    Generate the handler of an operation specialized for its parameter types
+
+    Args:
+        op          (int)            : Operation (OP_CODES)
+        param_types (tuple[int, ...]): Types of the parameters used (PARAM_TYPES)
+
+    Returns:
+        (Handler?): Specialized handler; `None` if a written parameter is of
+                    `PARAM_TYPES.VALUE` type
+    """
+    lines = instruction_lines(op, param_types)
+    if lines is None:
+        return None
+    types_str = "".join(str(int(param_type)) for param_type in param_types)
+    name = f"_{OP_CODES(op).name.lower()}_{types_str}"
+    source = f"def {name}(m, memory, dense, pointer, a, b, c):\n" + "".join(
+        f"    {line}\n" for line in lines
+    )
+    namespace: Dict[str, object] = {"StopExecution": StopExecution}
+    exec(compile(source, f"<intcode {name}>", "exec"), namespace)
+    return namespace[name]  # type: ignore
+
+
+def _build_table() -> List[Optional[Tuple[Handler, int]]]:
+    """
+    Build the dispatch table
+
+    Returns:
+        (list[tuple[Handler, int]?]): Specialized handler and instruction length,
+                                      indexed by opcode; `None` for invalid opcodes
+    """
+    table: List[Optional[Tuple[Handler, int]]] = [None] * (MAX_OP_CODE + 1)
+    for op, (kinds, _) in _TEMPLATES.items():
+        for param_types in product(PARAM_TYPES, repeat=len(kinds)):
+            handler = _make_handler(op, param_types)
+            if handler is None:
+                continue
+            op_code = op
+            for place, param_type in enumerate(param_types, 2):
+                op_code += param_type * 10 ** place
+            table[op_code] = (handler, len(kinds) + 1)
+    return table
+
+
+def _build_moduli() -> List[int]:
+    """
+    Build the table of the moduli keeping the digits of an opcode that matter
+
+    Returns:
+        (list[int]): Modulus keeping the operation and the type digits of the
+                     parameters it uses, indexed by operation; 100000 for unknown
+                     operations
+    """
+    moduli = [100000] * 100
+    for op, (kinds, _) in _TEMPLATES.items():
+        moduli[op] = 100 * 10 ** len(kinds)
+    return moduli
+
+
+# Specialized handler and instruction length, indexed by opcode (modulo 100000), with
+#   the type digits of unused parameters set to 0
+DISPATCH = _build_table()
+
+# Type digits of unused parameters are ignored, like extra digits: an opcode is
+#   reduced modulo the entry of its operation before looking it up in `DISPATCH`
+MODULI = _build_moduli()
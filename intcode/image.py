@@ -0,0 +1,225 @@
+"""
+Binary images of IntCode programs, loaded by mapping them in memory
+
+Image layout, all little-endian:
+    header : magic b"ICIM", version (u32), program length (u64), number of big
+             cells (u64)
+    cells  : int64 cells of the program, padded to whole pages of `PAGE_SIZE` cells;
+             cells that do not fit in int64 hold `BIG`
+    bigs   : for each big cell, its address (u64), the length of its value (u32)
+             and its value (signed, that many bytes)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence
+
+from .memory import BIG, INT64_MAX, PAGE_MASK, Memory
+from .parse import parse_program
+
+MAGIC = b"ICIM"
+VERSION = 1
+HEADER = struct.Struct("<4sIQQ")
+BIG_HEADER = struct.Struct("<QI")
+
+# Default suffix of image files
+SUFFIX = ".icim"
+
+
+def _cache_path() -> Path:
+    """
+    Get the directory where converted text programs are cached: `$INTCODE_CACHE`,
+      default `intcode` in the user's cache directory
+
+    Returns:
+        (Path): Cache directory
+    """
+    if "INTCODE_CACHE" in os.environ:
+        return Path(os.environ["INTCODE_CACHE"])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "intcode"
+
+
+def write_image(codes: Iterable[int], path: Path) -> None:
+    """
+    Write a program as a binary image
+    The image is written next to `path` first and moved in place, so that readers
+      never see a partial image
+
+    Args:
+        codes (Iterable[int]): Program codes
+        path  (Path)         : Path of the image
+    """
+    codes = list(codes)
+    cells = array("q", bytes(8 * (len(codes) + (-len(codes) & PAGE_MASK))))
+    bigs: Dict[int, int] = {}
+    for address, code in enumerate(codes):
+        if BIG < code <= INT64_MAX:
+            cells[address] = code
+        else:
+            cells[address] = BIG
+            bigs[address] = code
+    if sys.byteorder != "little":
+        cells.byteswap()
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with temp_path.open("wb") as image_fp:
+        image_fp.write(HEADER.pack(MAGIC, VERSION, len(codes), len(bigs)))
+        image_fp.write(cells.tobytes())
+        for address, value in bigs.items():
+            data = value.to_bytes((value.bit_length() + 8) // 8, "little", signed=True)
+            image_fp.write(BIG_HEADER.pack(address, len(data)))
+            image_fp.write(data)
+    os.replace(temp_path, path)
+
+
+def is_image(path: Path) -> bool:
+    """
+    Check whether a file is a binary image
+
+    Args:
+        path (Path): Path of the file
+
+    Returns:
+        (bool): Whether the file starts with the image magic
+    """
+    with path.open("rb") as file_fp:
+        return file_fp.read(len(MAGIC)) == MAGIC
+
+
+class Image:
+    """
+    Binary image of a program, mapped in memory
+
+    Args:
+        path (Path): Path of the image
+
+    Public Properties:
+        path   (Path)          : Path of the image
+        length (int)           : Number of cells of the program
+        big    (dict[int, int]): Values of the cells that overflow int64
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as image_fp:
+            magic, version, self.length, big_count = HEADER.unpack(
+                image_fp.read(HEADER.size)
+            )
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not an IntCode image")
+            if version != VERSION:
+                raise ValueError(f"{path} has unsupported image {version=}")
+            self._cells = self.length + (-self.length & PAGE_MASK)
+            image_fp.seek(HEADER.size + 8 * self._cells)
+            self.big: Dict[int, int] = {}
+            for _ in range(big_count):
+                address, size = BIG_HEADER.unpack(image_fp.read(BIG_HEADER.size))
+                self.big[address] = int.from_bytes(
+                    image_fp.read(size), "little", signed=True
+                )
+
+    def memory(self) -> Memory:
+        """
+        Make a memory holding the program
+        The cells are a private mapping of the image: pages of the file are only read
+          when touched, and only copied when written to
+
+        Returns:
+            (Memory): New memory
+        """
+        memory = Memory()
+        if sys.byteorder != "little" or not self._cells:
+            # A mapping cannot be empty, nor be used as is on big-endian machines
+            dense = array("q")
+            with self.path.open("rb") as image_fp:
+                image_fp.seek(HEADER.size)
+                dense.frombytes(image_fp.read(8 * self._cells))
+            if sys.byteorder != "little":
+                dense.byteswap()
+            memory.dense = dense
+        else:
+            with self.path.open("rb") as image_fp:
+                mapping = mmap.mmap(image_fp.fileno(), 0, access=mmap.ACCESS_COPY)
+            memory.dense = memoryview(mapping)[
+                HEADER.size : HEADER.size + 8 * self._cells
+            ].cast("q")
+        memory.big.update(self.big)
+        return memory
+
+
+def program_hash(codes: Iterable[int]) -> str:
+    """
+    Hash a program by its comma-separated text
+
+    Args:
+        codes (Iterable[int]): Program codes
+
+    Returns:
+        (str): SHA-256 of the program, in hexadecimal
+    """
+    return hashlib.sha256(",".join(map(str, codes)).encode()).hexdigest()
+
+
+def cache_program(codes: Sequence[int], cache: Optional[Path] = None) -> str:
+    """
+    Write a program to the image cache, unless it is already there, so that other
+      processes can map it knowing only its hash; see `cached_image`
+
+    Args:
+        codes (Sequence[int]): Program codes
+        cache (Path?)        : Directory of the cached images, default
+                               `$INTCODE_CACHE`, or `intcode` in the user's cache
+                               directory
+
+    Returns:
+        (str): Hash of the program
+    """
+    digest = program_hash(codes)
+    cache = cache or _cache_path()
+    image_path = cache / f"{digest}{SUFFIX}"
+    if not image_path.exists():
+        cache.mkdir(parents=True, exist_ok=True)
+        write_image(codes, image_path)
+    return digest
+
+
+def cached_image(digest: str, cache: Optional[Path] = None) -> Image:
+    """
+    Map a program of the image cache
+
+    Args:
+        digest (str)  : Hash of the program, as given by `cache_program`
+        cache  (Path?): Directory of the cached images, default `$INTCODE_CACHE`, or
+                        `intcode` in the user's cache directory
+
+    Returns:
+        (Image): Mapped image of the program
+    """
+    return Image((cache or _cache_path()) / f"{digest}{SUFFIX}")
+
+
+def load_program(path: Path, cache: Optional[Path] = None) -> Image:
+    """
+    Load a program, either a binary image or a comma-separated text file
+    Text files are converted to images once, cached by the hash of their codes (see
+      `cache_program`), so that a program is cached once whether it comes from text
+      or from codes
+
+    Args:
+        path  (Path) : Path of the program
+        cache (Path?): Directory of the cached images, default `$INTCODE_CACHE`, or
+                       `intcode` in the user's cache directory
+
+    Returns:
+        (Image): Mapped image of the program
+    """
+    if is_image(path):
+        return Image(path)
+    return cached_image(cache_program(parse_program(path), cache), cache)
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Dict, List, NamedTuple
+
+from .decode import StaticInstruction, decode_static, fetch
+from .dispatch import StopExecution, instruction_lines
+from .opcodes import OP_CODES
+
+if TYPE_CHECKING:
+    from .machine import Machine
+    from .memory import DenseCells, Memory
+
+# Executes a basic block and returns the new instruction pointer
+#   Args: machine, memory, dense image of the memory
+BlockFunction = Callable[["Machine", "Memory", "DenseCells"], int]
+
+# Operations after which execution does not simply fall through
+BLOCK_ENDS = {OP_CODES.JUMP_TRUE, OP_CODES.JUMP_FALSE, OP_CODES.END}
+
+# Longest straight-line run compiled into a single block
+MAX_BLOCK_SIZE = 256
+
+# Number of times an address is reached by the interpreter before the block starting
+#   there is compiled. Code that only runs a few times, or that keeps overwriting
+#   itself, is not worth compiling
+HOT_THRESHOLD = 8
+
+
+class Block(NamedTuple):
+    """
+    A compiled basic block
+
+    Properties:
+        function (BlockFunction): Function executing the block
+        start    (int)          : Address of the first instruction
+        end      (int)          : Address right after the last instruction
+        size     (int)          : Number of instructions
+    """
+
+    function: BlockFunction
+    start: int
+    end: int
+    size: int
+
+
+def block_instructions(memory: Memory, start: int) -> List[StaticInstruction]:
+    """
+    Decode the straight-line instructions starting at `start`, up to and including
+      the first jump or halt
+    The block also stops before anything that does not decode, so that the error is
+      only raised if execution gets there
+
+    Args:
+        memory (Memory): Memory of the machine
+        start  (int)   : Address of the first instruction
+
+    Returns:
+        (list[StaticInstruction]): Instructions of the block, in order
+    """
+    instructions: List[StaticInstruction] = []
+    address = start
+    while len(instructions) < MAX_BLOCK_SIZE:
+        try:
+            instruction = decode_static(memory, address)
+        except (ValueError, IndexError):
+            if not instructions:
+                raise
+            break
+        instructions.append(instruction)
+        if instruction.op in BLOCK_ENDS:
+            break
+        address += instruction.length
+    return instructions
+
+
+def compile_block(memory: Memory, start: int) -> Block:
+    """
+    Compile the basic block starting at `start`, and cache it in `memory.blocks`
+    Operands are baked into the generated code as constants, and the relative base
+      is kept in a local variable. The block returns early if it overwrites a
+      decoded instruction, as it may have overwritten itself
+
+    Args:
+        memory (Memory): Memory of the machine
+        start  (int)   : Address of the first instruction
+
+    Returns:
+        (Block): Compiled block
+    """
+    instructions = block_instructions(memory, start)
+    adjusts_rel_base = any(
+        instruction.op == OP_CODES.ADJUST_REL_BASE for instruction in instructions
+    )
+    save = ["m.rel_base = rb"] if adjusts_rel_base else []
+    lines = ["rb = m.rel_base"]
+    for i, (address, op, param_types, params, length) in enumerate(instructions):
+        is_last = i == len(instructions) - 1
+        next_address = address + length
+        body = instruction_lines(
+            op,
+            param_types,
+            [str(param) for param in params],
+            pointer=str(address),
+            rel_base="rb",
+            on_invalidate=[f"return {next_address}"],
+        )
+        assert body is not None
+        for line in body:
+            stripped = line.lstrip()
+            indent = line[: len(line) - len(stripped)]
+            if stripped == f"return {address} + {length}" and not is_last:
+                # Fall through to the next instruction
+                continue
+            if stripped.startswith("return "):
+                lines += [indent + saved for saved in save]
+            elif stripped.startswith("raise StopExecution"):
+                lines += [indent + saved for saved in save]
+                lines.append(f"{indent}m.pointer = {address}")
+            lines.append(line)
+    end = instructions[-1].address + instructions[-1].length
+    name = f"_block_{start}"
+    source = f"def {name}(m, memory, dense):\n" + "".join(
+        f"    {line}\n" for line in lines
+    )
+    namespace: Dict[str, object] = {"StopExecution": StopExecution}
+    exec(compile(source, f"<intcode {name}>", "exec"), namespace)
+    block = Block(namespace[name], start, end, len(instructions))  # type: ignore
+    memory.blocks[start] = block
+    return block
+
+
+def execute_blocks(machine: Machine) -> None:
+    """
+    Execute a machine block by block until the program halts or needs input that is
+      not available
+    Instructions are interpreted until their address gets hot; the block starting
+      there is compiled then. Compiling a block resets the heat of its address, so
+      that blocks that keep being overwritten are only recompiled once in a while
+
+    Args:
+        machine (Machine): Machine to run
+    """
+    memory = machine.memory
+    dense = memory.dense
+    decoded = memory.decoded
+    blocks = memory.blocks
+    heat: Dict[int, int] = {}
+    pointer = machine.pointer
+    try:
+        while True:
+            try:
+                function, _, _, _ = blocks[pointer]
+            except KeyError:
+                count = heat.get(pointer, 0) + 1
+                if count < HOT_THRESHOLD:
+                    heat[pointer] = count
+                    try:
+                        handler, a, b, c, _ = decoded[pointer]
+                    except KeyError:
+                        handler, a, b, c, _ = fetch(memory, pointer)
+                    try:
+                        pointer = handler(machine, memory, dense, pointer, a, b, c)
+                    except StopExecution:
+                        machine.pointer = pointer
+                        raise
+                    continue
+                heat[pointer] = 0
+                function, _, _, _ = compile_block(memory, pointer)
+            pointer = function(machine, memory, dense)
+    except StopExecution:
+        # The pointer to resume from has been stored
+        pass
@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import (
+    TYPE_CHECKING,
+    Deque,
+    Iterable,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+    overload,
+)
+
+from .decode import fetch
+from .disasm import ControlFlowGraph
+from .dispatch import StopExecution
+from .image import Image
+from .jit import execute_blocks
+from .memory import Memory
+from .opcodes import OP_CODES
+
+if TYPE_CHECKING:
+    from .memo import Memoizer
+    from .profile import Profile
+
+
+class Snapshot(NamedTuple):
+    """
+    Saved state of a machine, see `Machine.snapshot`
+
+    Properties:
+        memory   (Memory)         : Memory of the machine; never run directly
+        pointer  (int)            : Instruction pointer
+        rel_base (int)            : Relative base
+        inputs   (tuple[int, ...]): Pending input values
+        outputs  (tuple[int, ...]): Produced output values, not yet drained
+        halted   (bool)           : Whether op 99 has been reached
+    """
+
+    memory: Memory
+    pointer: int
+    rel_base: int
+    inputs: Tuple[int, ...]
+    outputs: Tuple[int, ...]
+    halted: bool
+
+
+class Machine:
+    """
+    IntCode computer
+
+    Args:
+        codes   (Iterable[int] | Memory | Image): Initial code, memory to start from
+                                                  (copied, along with its code,
+                                                  decoded once), or program image
+                                                  (mapped)
+        inputs  (Iterable[int])                 : Initial input values, default
+                                                  none
+        jit     (bool)                          : Whether to compile basic blocks to
+                                                  Python functions instead of
+                                                  dispatching each instruction;
+                                                  pays off for long runs
+        profile (Profile?)                      : Counters to record the execution
+                                                  into; slower, and ignores `jit`
+        memo    (Memoizer?)                     : Cache of pure subroutine calls to
+                                                  skip; slower per instruction, and
+                                                  ignores `jit`
+
+    Public Properties:
+        memory   (Memory)    : Memory of the machine
+        pointer  (int)       : Instruction pointer
+        rel_base (int)       : Relative base for `PARAM_TYPES.RELATIVE` parameters
+        inputs   (deque[int]): Pending input values, consumed by op 3
+        outputs  (deque[int]): Produced output values, not yet drained
+        halted   (bool)      : Whether op 99 has been reached
+        jit      (bool)      : Whether basic blocks are compiled
+        profile  (Profile?)  : Counters the execution is recorded into, if any
+        memo     (Memoizer?) : Cache of pure subroutine calls, if any
+    """
+
+    jit = False
+    profile: Optional[Profile] = None
+    memo: Optional[Memoizer] = None
+
+    def __init__(
+        self,
+        codes: Union[Iterable[int], Memory, Image],
+        inputs: Iterable[int] = (),
+        jit: bool = False,
+        profile: Optional[Profile] = None,
+        memo: Optional[Memoizer] = None,
+    ) -> None:
+        if isinstance(codes, Memory):
+            if not codes.decoded:
+                # Decode the reachable code in the memory itself, once, so that
+                #   every machine started from it shares the decoded instructions
+                ControlFlowGraph(codes)
+            self.memory = codes.copy()
+        elif isinstance(codes, Image):
+            self.memory = codes.memory()
+        else:
+            self.memory = Memory(codes)
+        self.pointer = 0
+        self.rel_base = 0
+        self.inputs: Deque[int] = deque(inputs)
+        self.outputs: Deque[int] = deque()
+        self.halted = False
+        self.jit = jit
+        self.profile = profile
+        self.memo = memo
+
+    @property
+    def waiting(self) -> bool:
+        """
+        Whether the machine is blocked on op 3 with no pending input
+        """
+        return (
+            not self.halted
+            and not self.inputs
+            and self.memory[self.pointer] % 100 == OP_CODES.INPUT
+        )
+
+    @property
+    def sliceable(self) -> bool:
+        """
+        Whether the machine can run a number of instructions at a time (see
+          `run_for`): only without compiled blocks, profiling or memoization
+        """
+        return not self.jit and self.profile is None and self.memo is None
+
+    def snapshot(self) -> Snapshot:
+        """
+        Save the state of the machine, so that it can be restored or forked any
+          number of times
+
+        Returns:
+            (Snapshot): Saved state
+        """
+        return Snapshot(
+            self.memory.copy(),
+            self.pointer,
+            self.rel_base,
+            tuple(self.inputs),
+            tuple(self.outputs),
+            self.halted,
+        )
+
+    def restore(self, snapshot: Snapshot) -> None:
+        """
+        Reset the machine to a saved state
+
+        Args:
+            snapshot (Snapshot): Saved state
+        """
+        self.memory = snapshot.memory.copy()
+        self.pointer = snapshot.pointer
+        self.rel_base = snapshot.rel_base
+        self.inputs = deque(snapshot.inputs)
+        self.outputs = deque(snapshot.outputs)
+        self.halted = snapshot.halted
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Snapshot) -> Machine:
+        """
+        Make a new machine in a saved state
+
+        Args:
+            snapshot (Snapshot): Saved state
+
+        Returns:
+            (Machine): New machine
+        """
+        machine = cls.__new__(cls)
+        machine.restore(snapshot)
+        return machine
+
+    def fork(self) -> Machine:
+        """
+        Make an independent copy of the machine in its current state
+
+        Returns:
+            (Machine): New machine
+        """
+        machine = Machine.from_snapshot(
+            Snapshot(
+                self.memory,
+                self.pointer,
+                self.rel_base,
+                tuple(self.inputs),
+                tuple(self.outputs),
+                self.halted,
+            )
+        )
+        machine.jit = self.jit
+        machine.profile = self.profile
+        machine.memo = self.memo
+        return machine
+
+    def feed_input(self, *values: int) -> None:
+        """
+        Queue values to be consumed by op 3
+
+        Args:
+            *values (int): Input values, in order
+        """
+        self.inputs.extend(values)
+
+    def drain_output(self) -> List[int]:
+        """
+        Take all the output values produced so far
+
+        Returns:
+            (list[int]): Output values, in order
+        """
+        outputs = list(self.outputs)
+        self.outputs.clear()
+        return outputs
+
+    @overload
+    def run(self, until: None = None) -> bool:
+        ...
+
+    @overload
+    def run(self, until: Literal["input_needed"]) -> List[int]:
+        ...
+
+    def run(self, until: Optional[str] = None) -> Union[bool, List[int]]:
+        """
+        Execute until the program halts or needs input that is not available
+
+        Args:
+            until (str?): `None` to report whether the program has halted;
+                          "input_needed" to take the output values produced so far
+                          instead, so that drivers exchange values in batches
+
+        Returns:
+            (bool)     : If `until` is `None`, whether the program has halted
+            (list[int]): If `until` is "input_needed", output values, in order
+        """
+        if until not in (None, "input_needed"):
+            raise ValueError(f"{until=} unknown stop condition")
+        if not self.halted:
+            if self.profile is not None:
+                self.profile.execute(self)
+            elif self.memo is not None:
+                self.memo.execute(self)
+            elif self.jit:
+                execute_blocks(self)
+            else:
+                self._execute()
+        if until is None:
+            return self.halted
+        return self.drain_output()
+
+    def _execute(self) -> None:
+        """
+        Execute until the program halts or needs input that is not available
+        """
+        memory = self.memory
+        dense = memory.dense
+        decoded = memory.decoded
+        pointer = self.pointer
+        try:
+            while True:
+                try:
+                    handler, a, b, c, _ = decoded[pointer]
+                except KeyError:
+                    handler, a, b, c, _ = fetch(memory, pointer)
+                pointer = handler(self, memory, dense, pointer, a, b, c)
+        except StopExecution:
+            self.pointer = pointer
+
+    def run_for(self, steps: int) -> int:
+        """
+        Execute up to a number of instructions, stopping early if the program halts or
+          needs input that is not available
+
+        Args:
+            steps (int): Maximum number of instructions to execute
+
+        Returns:
+            (int): Number of instructions executed
+        """
+        if not self.sliceable:
+            raise ValueError(
+                "Machines with jit, profile or memo cannot run a number of "
+                "instructions at a time"
+            )
+        if self.halted:
+            return 0
+        memory = self.memory
+        dense = memory.dense
+        decoded = memory.decoded
+        pointer = self.pointer
+        executed = 0
+        try:
+            for executed in range(steps):
+                try:
+                    handler, a, b, c, _ = decoded[pointer]
+                except KeyError:
+                    handler, a, b, c, _ = fetch(memory, pointer)
+                pointer = handler(self, memory, dense, pointer, a, b, c)
+            else:
+                executed = steps
+        except StopExecution:
+            pass
+        self.pointer = pointer
+        return executed
+
+    def step(self) -> bool:
+        """
+        Execute one instruction
+
+        Returns:
+            (bool): Whether an instruction was executed; `False` if the program has
+                    halted or is blocked on input
+        """
+        if self.halted:
+            return False
+        memory = self.memory
+        handler, a, b, c, _ = fetch(memory, self.pointer)
+        try:
+            self.pointer = handler(self, memory, memory.dense, self.pointer, a, b, c)
+        except StopExecution:
+            return False
+        return True
@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
+
+from .decode import decode_static
+from .opcodes import OP_CODES, PARAM_TYPES
+
+if TYPE_CHECKING:
+    from .machine import Machine
+
+# Location of a cell as seen from a call: (whether it is relative to the relative
+#   base at the call, address or offset)
+Location = Tuple[bool, int]
+
+# Memoized call: (entry address, locations read before being written, their values)
+Key = Tuple[int, Tuple[Location, ...], Tuple[int, ...]]
+
+# Effects of a memoized call: (values written, by location; address returned to)
+Effects = Tuple[Tuple[Tuple[Location, int], ...], int]
+
+# Number of distinct sets of locations read remembered per subroutine
+MAX_PATTERNS = 16
+
+
+class _Frame:
+    """
+    Call being recorded
+
+    Args:
+        entry    (int): Address of the subroutine
+        rel_base (int): Relative base at the call
+
+    Properties:
+        entry     (int)                : Address of the subroutine
+        rel_base  (int)                : Relative base at the call
+        reads     (dict[Location, int]): Values of the cells read before being
+                                         written, in order of first read
+        writes    (dict[Location, int]): Last values written
+        locations (dict[int, Location]): Location each address was accessed as
+        valid     (bool)               : Whether the call can still be memoized
+    """
+
+    def __init__(self, entry: int, rel_base: int) -> None:
+        self.entry = entry
+        self.rel_base = rel_base
+        self.reads: Dict[Location, int] = {}
+        self.writes: Dict[Location, int] = {}
+        self.locations: Dict[int, Location] = {}
+        self.valid = True
+
+    def location(self, address: int, relative: bool) -> Location:
+        """
+        Get the location of an address as seen from the call; the same address must
+          always be accessed the same way, or the call is not memoized
+
+        Args:
+            address  (int) : Address of the cell
+            relative (bool): Whether it is accessed relative to the relative base
+
+        Returns:
+            (Location): Location of the cell
+        """
+        location = (True, address - self.rel_base) if relative else (False, address)
+        if self.locations.setdefault(address, location) != location:
+            self.valid = False
+        return location
+
+    def read(self, address: int, relative: bool, value: int) -> None:
+        location = self.location(address, relative)
+        if location not in self.writes and location not in self.reads:
+            self.reads[location] = value
+
+    def write(self, address: int, relative: bool, value: int) -> None:
+        location = self.location(address, relative)
+        # A relative write below the frame of the call reaches into its caller's
+        if relative and location[1] < 0:
+            self.valid = False
+        self.writes[location] = value
+
+    def merge(
+        self,
+        rel_base: int,
+        reads: Iterable[Tuple[Location, int]],
+        writes: Iterable[Tuple[Location, int]],
+    ) -> None:
+        """
+        Account for the reads and writes of a nested call
+
+        Args:
+            rel_base (int)                           : Relative base at the nested
+                                                       call
+            reads    (Iterable[tuple[Location, int]]): Values of the cells the nested
+                                                       call read before writing them
+            writes   (Iterable[tuple[Location, int]]): Last values the nested call
+                                                       wrote
+        """
+        for (relative, offset), value in reads:
+            self.read(offset + rel_base if relative else offset, relative, value)
+        for (relative, offset), value in writes:
+            self.write(offset + rel_base if relative else offset, relative, value)
+
+
+class Memoizer:
+    """
+    Execute machines while memoizing the calls to pure subroutines
+    A call is a jump to an instruction that grows the relative base by a constant,
+      and returns with the first jump taken once the relative base is back to its
+      value at the call. Calls are recorded, and memoized unless they use op 3 or
+      op 4, write below their stack frame, write to code, or access a cell both
+      relative to the relative base and not. A later call of the same subroutine
+      reading the same values is then skipped, and its writes applied directly
+    Code is assumed not to be modified, outside of what the recorded calls see;
+      writes to code clear the cache
+
+    Args:
+        maxsize (int): Maximum number of memoized calls, least recently used first
+                       dropped
+
+    Public Properties:
+        cache  (OrderedDict[Key, Effects]): Memoized calls, least recently used first
+        impure (set[int])                 : Addresses of the subroutines that cannot
+                                            be memoized
+        hits   (int)                      : Number of calls skipped
+        misses (int)                      : Number of calls executed
+    """
+
+    def __init__(self, maxsize: int = 1 << 16) -> None:
+        self.maxsize = maxsize
+        self.cache: OrderedDict[Key, Effects] = OrderedDict()
+        self.impure: Set[int] = set()
+        self.hits = 0
+        self.misses = 0
+        self._patterns: Dict[int, List[Tuple[Location, ...]]] = {}
+
+    def execute(self, machine: Machine) -> None:
+        """
+        Execute a machine until the program halts or needs input that is not
+          available
+
+        Args:
+            machine (Machine): Machine to run
+        """
+        memory = machine.memory
+        frames: List[_Frame] = []
+        pointer = machine.pointer
+
+        def address_of(index: int) -> int:
+            param_type = param_types[index]
+            address = params[index]
+            if param_type == PARAM_TYPES.RELATIVE:
+                address += machine.rel_base
+                if address < 0:
+                    raise IndexError(f"Index cannot be negative; got {address}")
+            return address
+
+        def read(index: int) -> int:
+            if param_types[index] == PARAM_TYPES.VALUE:
+                return params[index]
+            address = address_of(index)
+            value = memory[address]
+            if frames:
+                relative = param_types[index] == PARAM_TYPES.RELATIVE
+                frames[-1].read(address, relative, value)
+            return value
+
+        def write(index: int, value: int) -> None:
+            address = address_of(index)
+            if frames:
+                relative = param_types[index] == PARAM_TYPES.RELATIVE
+                frames[-1].write(address, relative, value)
+            if address in memory.code:
+                self._clear()
+                self._invalidate(frames)
+            memory[address] = value
+
+        while True:
+            _, op, param_types, params, length = decode_static(memory, pointer)
+            next_pointer = pointer + length
+            if op == OP_CODES.ADD:
+                write(2, read(0) + read(1))
+            elif op == OP_CODES.MUL:
+                write(2, read(0) * read(1))
+            elif op == OP_CODES.INPUT:
+                self._invalidate(frames)
+                if not machine.inputs:
+                    break
+                write(0, machine.inputs.popleft())
+            elif op == OP_CODES.OUTPUT:
+                self._invalidate(frames)
+                machine.outputs.append(read(0))
+            elif op in (OP_CODES.JUMP_TRUE, OP_CODES.JUMP_FALSE):
+                # Both parameters are read either way, like the other modes do
+                param1 = read(0)
+                param2 = read(1)
+                if bool(param1) == (op == OP_CODES.JUMP_TRUE):
+                    next_pointer = param2
+                    if frames and machine.rel_base == frames[-1].rel_base:
+                        frame = frames.pop()
+                        self._store(frame, next_pointer)
+                        # The caller sees what the call did
+                        if frames:
+                            frames[-1].valid &= frame.valid
+                            frames[-1].merge(
+                                frame.rel_base,
+                                frame.reads.items(),
+                                frame.writes.items(),
+                            )
+                    if self._is_call(machine, next_pointer):
+                        effects = self._lookup(machine, next_pointer, frames)
+                        if effects is not None:
+                            next_pointer = effects[1]
+                        else:
+                            frames.append(_Frame(next_pointer, machine.rel_base))
+            elif op in (OP_CODES.LESS_THAN, OP_CODES.EQUAL):
+                param1 = read(0)
+                param2 = read(1)
+                if op == OP_CODES.LESS_THAN:
+                    write(2, int(param1 < param2))
+                else:
+                    write(2, int(param1 == param2))
+            elif op == OP_CODES.ADJUST_REL_BASE:
+                machine.rel_base += read(0)
+            else:
+                machine.halted = True
+                break
+            pointer = next_pointer
+        machine.pointer = pointer
+
+    def _is_call(self, machine: Machine, target: int) -> bool:
+        """
+        Check whether a jump target starts a subroutine that may be memoized: it
+          grows the relative base by a constant
+
+        Args:
+            machine (Machine): Machine jumping
+            target  (int)    : Target of the jump
+
+        Returns:
+            (bool): Whether the jump is a call
+        """
+        if target in self.impure or target < 0:
+            return False
+        memory = machine.memory
+        return memory[target] % 1000 == 100 + OP_CODES.ADJUST_REL_BASE and (
+            memory[target + 1] > 0
+        )
+
+    def _lookup(
+        self, machine: Machine, entry: int, frames: List[_Frame]
+    ) -> Optional[Effects]:
+        """
+        Look for a memoized call matching the current state, and apply its writes
+
+        Args:
+            machine (Machine)     : Machine calling the subroutine
+            entry   (int)         : Address of the subroutine
+            frames  (list[_Frame]): Calls being recorded; the innermost one sees the
+                                    reads and writes of the memoized call
+
+        Returns:
+            (Effects?): Effects of the memoized call; `None` if there is none
+        """
+        memory = machine.memory
+        rel_base = machine.rel_base
+        for pattern in self._patterns.get(entry, ()):
+            addresses = [
+                offset + rel_base if relative else offset
+                for relative, offset in pattern
+            ]
+            if min(addresses, default=0) < 0:
+                continue
+            values = tuple(memory[address] for address in addresses)
+            effects = self.cache.get((entry, pattern, values))
+            if effects is None:
+                continue
+            self.cache.move_to_end((entry, pattern, values))
+            self.hits += 1
+            for (relative, offset), value in effects[0]:
+                memory[offset + rel_base if relative else offset] = value
+            if frames:
+                frames[-1].merge(rel_base, zip(pattern, values), effects[0])
+            return effects
+        self.misses += 1
+        return None
+
+    def _store(self, frame: _Frame, return_to: int) -> None:
+        """
+        Memoize a call that returned
+
+        Args:
+            frame     (_Frame): Recorded call
+            return_to (int)   : Address the call returned to
+        """
+        if not frame.valid:
+            return
+        pattern = tuple(frame.reads)
+        patterns = self._patterns.setdefault(frame.entry, [])
+        if pattern not in patterns:
+            patterns.append(pattern)
+            if len(patterns) > MAX_PATTERNS:
+                patterns.pop(0)
+        key = (frame.entry, pattern, tuple(frame.reads.values()))
+        self.cache[key] = (tuple(frame.writes.items()), return_to)
+        self.cache.move_to_end(key)
+        if len(self.cache) > self.maxsize:
+            self.cache.popitem(last=False)
+
+    def _invalidate(self, frames: List[_Frame]) -> None:
+        """
+        Mark the calls being recorded as impure
+
+        Args:
+            frames (list[_Frame]): Calls being recorded
+        """
+        for frame in frames:
+            frame.valid = False
+            self.impure.add(frame.entry)
+
+    def _clear(self) -> None:
+        """
+        Forget all memoized calls
+        """
+        self.cache.clear()
+        self._patterns.clear()
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+from array import array
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Set, Union
+
+if TYPE_CHECKING:
+    from .decode import Instruction
+    from .jit import Block
+
+# Cells are grouped into pages of `PAGE_SIZE` cells
+PAGE_BITS = 10
+PAGE_SIZE = 1 << PAGE_BITS
+PAGE_MASK = PAGE_SIZE - 1
+
+# The dense image grows page by page up to this many cells; pages beyond it are
+#   kept sparse
+DENSE_LIMIT = 1 << 20
+
+# Bounds of what an int64 cell holds. `BIG` itself marks a cell whose value is held
+#   in `Memory.big` instead, so only values strictly above it are stored directly
+BIG = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+
+# Dense cells of a memory: an int64 array, or an int64 view of a mapped program image
+#   (see `image`), which does not grow
+DenseCells = Union["array[int]", memoryview]
+
+
+class Memory:
+    """
+    Memory of an IntCode machine. Allows access outside the original data (default
+      0) without allocating anything on reads
+
+    Cells are int64. The program image (and anything contiguous after it, up to
+      `DENSE_LIMIT` cells) is a dense array; farther addresses are kept in pages
+      allocated on first write, and shared copy-on-write between copies. Cells whose
+      value does not fit in int64 hold `BIG` and have their value in `big`
+    The dense image may also be a view of a mapped program image (see `image`); it
+      does not grow then
+
+    Args:
+        it (Iterable[int]): Initial code, default empty
+
+    Properties:
+        dense   (DenseCells)             : Dense cells, from address 0
+        pages   (dict[int, array[int]])  : Sparse pages beyond `dense`, by page number
+        big     (dict[int, int])         : Values of cells that overflow int64
+        decoded (dict[int, Instruction]) : Decoded instructions, keyed by address
+        blocks  (dict[int, Block])       : Compiled basic blocks, keyed by address
+        code    (set[int])               : Addresses of cells that are part of a
+                                           decoded instruction
+        shared  (set[int])               : Numbers of the pages shared with a copy
+        origin  (Memory?)                : Memory this one was copied from, which is
+                                           given the instructions decoded here that
+                                           it holds too (see `fetch`)
+    """
+
+    def __init__(self, it: Iterable[int] = ()) -> None:
+        self.dense: DenseCells
+        self.pages: Dict[int, array[int]] = {}
+        self.big: Dict[int, int] = {}
+        self.decoded: Dict[int, Instruction] = {}
+        self.blocks: Dict[int, Block] = {}
+        self.code: Set[int] = set()
+        self.shared: Set[int] = set()
+        self.origin: Optional[Memory] = None
+        # Parsed programs are already int64 arrays (see `parse`)
+        codes = it if isinstance(it, array) and it.typecode == "q" else list(it)
+        try:
+            dense = array("q", codes)
+            fits = BIG not in dense
+        except OverflowError:
+            fits = False
+        if not fits:
+            dense = self.dense = array("q", bytes(8 * len(codes)))
+            for index, code in enumerate(codes):
+                self.store(index, code)
+        # Pad to whole pages
+        dense.frombytes(bytes(8 * (-len(dense) & PAGE_MASK)))
+        self.dense = dense
+
+    def __getitem__(self, index: int) -> int:
+        """
+        Only allows access of 1 element
+        Disallows negative indices
+        Allows access outside original data (default 0)
+        """
+        return self.load(index)
+
+    def __setitem__(self, index: int, value: int) -> None:
+        """
+        Only allows access of 1 element
+        Disallows negative indices
+        Allows access outside original data (default 0)
+        Drops decoded instructions and compiled blocks that are overwritten
+        """
+        self.store(index, value)
+        if index in self.code:
+            self.invalidate(index)
+
+    def copy(self) -> Memory:
+        """
+        Copy the memory, along with its decoded instructions and compiled blocks
+        The dense image is copied right away; sparse pages are only copied once
+          either side writes to them. Instructions the copy decodes later are shared
+          back, as long as the cells they are decoded from are still the same here
+
+        Returns:
+            (Memory): Independent copy
+        """
+        memory = Memory.__new__(Memory)
+        dense = array("q")
+        dense.frombytes(memoryview(self.dense).cast("B"))
+        memory.dense = dense
+        memory.pages = dict(self.pages)
+        memory.big = dict(self.big)
+        memory.decoded = dict(self.decoded)
+        memory.blocks = dict(self.blocks)
+        memory.code = set(self.code)
+        self.shared.update(self.pages)
+        memory.shared = set(self.pages)
+        memory.origin = self
+        return memory
+
+    def load(self, index: int) -> int:
+        """
+        Read a cell
+
+        Args:
+            index (int): Address of the cell
+
+        Returns:
+            (int): Value of the cell
+        """
+        if index < 0:
+            raise IndexError(f"Index cannot be negative; got {index}")
+        dense = self.dense
+        if index < len(dense):
+            value = dense[index]
+        else:
+            page = self.pages.get(index >> PAGE_BITS)
+            if page is None:
+                return 0
+            value = page[index & PAGE_MASK]
+        if value == BIG:
+            return self.big[index]
+        return value
+
+    def store(self, index: int, value: int) -> None:
+        """
+        Write a cell, without touching the decoded instructions
+
+        Args:
+            index (int): Address of the cell
+            value (int): New value of the cell
+        """
+        if index < 0:
+            raise IndexError(f"Index cannot be negative; got {index}")
+        if BIG < value <= INT64_MAX:
+            self.big.pop(index, None)
+        else:
+            self.big[index] = value
+            value = BIG
+        dense = self.dense
+        if index >= len(dense):
+            page_number = index >> PAGE_BITS
+            # Grow the dense image if the page is right after it
+            if (
+                page_number == len(dense) >> PAGE_BITS
+                and len(dense) < DENSE_LIMIT
+                and isinstance(dense, array)
+            ):
+                self._grow_dense(dense)
+            else:
+                page = self.pages.get(page_number)
+                if page is None:
+                    page = self.pages[page_number] = array("q", bytes(8 * PAGE_SIZE))
+                elif page_number in self.shared:
+                    page = self.pages[page_number] = array("q", page)
+                    self.shared.discard(page_number)
+                page[index & PAGE_MASK] = value
+                return
+        dense[index] = value
+
+    def _grow_dense(self, dense: array[int]) -> None:
+        """
+        Grow the dense image by 1 page, and take in the sparse pages that become
+          contiguous with it
+
+        Args:
+            dense (array[int]): Dense image, not a mapped one
+        """
+        page = self.pages.pop(len(dense) >> PAGE_BITS, None)
+        if page is None:
+            dense.frombytes(bytes(8 * PAGE_SIZE))
+        else:
+            self.shared.discard(len(dense) >> PAGE_BITS)
+            dense.extend(page)
+        while len(dense) < DENSE_LIMIT and len(dense) >> PAGE_BITS in self.pages:
+            self.shared.discard(len(dense) >> PAGE_BITS)
+            dense.extend(self.pages.pop(len(dense) >> PAGE_BITS))
+
+    def invalidate(self, address: int) -> None:
+        """
+        Drop the decoded instructions and compiled blocks covering `address`
+
+        Args:
+            address (int): Address of the modified cell
+        """
+        # Instructions are at most 4 cells long, so only those starting up to 3 cells
+        #   before `address` may cover it
+        for start in range(address - 3, address + 1):
+            instruction = self.decoded.get(start)
+            if instruction is not None and start + instruction.length > address:
+                del self.decoded[start]
+        # Self-modifying code is rare, so blocks are not indexed by the cells they
+        #   cover
+        if self.blocks:
+            for start in [
+                start
+                for start, block in self.blocks.items()
+                if start <= address < block.end
+            ]:
+                del self.blocks[start]
+        self.code.discard(address)
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from time import perf_counter
+from typing import DefaultDict, Dict, Iterable, List, NamedTuple, Optional, Set
+
+from .machine import Machine
+
+
+class Deadlock(Exception):
+    """
+    Raised when every running machine of a network waits for input that will never
+      come, or for room in a full channel
+    """
+
+
+class Channel:
+    """
+    Bounded FIFO carrying values from some machines to another one. Writers wait
+      while it is full. Once the reader halts, it is closed and values sent to it
+      are dropped
+
+    Args:
+        maxsize (int): Maximum number of values in flight; 0 for unbounded
+
+    Public Properties:
+        queue  (asyncio.Queue[int]): Values in flight
+        closed (bool)              : Whether the reader has halted
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.queue: asyncio.Queue[int] = asyncio.Queue(maxsize)
+        self.closed = False
+
+    async def put(self, value: int) -> None:
+        """
+        Send a value, waiting while the channel is full
+
+        Args:
+            value (int): Value to send
+        """
+        if not self.closed:
+            await self.queue.put(value)
+
+    def close(self) -> None:
+        """
+        Close the channel, releasing writers waiting for room
+        """
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+
+class Network:
+    """
+    IntCode machines connected by channels, each running as an asyncio task
+    Each machine reads from a single channel, that any number of machines may write
+      to; each output value of a machine is sent to every machine it is connected to
+
+    Args:
+        maxsize (int): Capacity of every channel; 0 for unbounded
+
+    Public Properties:
+        machines (dict[str, Machine])  : Machines, by name
+        messages (int)                 : Number of values produced by the last run
+        taps     (dict[str, list[int]]): Output values of the tapped machines
+    """
+
+    def __init__(self, maxsize: int = 1) -> None:
+        self.maxsize = maxsize
+        self.machines: Dict[str, Machine] = {}
+        self.messages = 0
+        self.taps: Dict[str, List[int]] = {}
+        self._edges: DefaultDict[str, List[str]] = defaultdict(list)
+        self._channels: Dict[str, Channel] = {}
+        self._live: Set[str] = set()
+        # Machines waiting for input, and for room in a channel
+        self._waiting: Set[str] = set()
+        self._writing: Dict[str, Channel] = {}
+
+    def add(self, name: str, machine: Machine) -> None:
+        """
+        Add a machine to the network
+
+        Args:
+            name    (str)    : Name of the machine
+            machine (Machine): Machine, with its initial input already queued
+        """
+        if name in self.machines:
+            raise ValueError(f"Machine {name!r} already exists")
+        self.machines[name] = machine
+
+    def connect(self, source: str, destination: str) -> None:
+        """
+        Send the output values of a machine to another one
+
+        Args:
+            source      (str): Name of the writing machine
+            destination (str): Name of the reading machine
+        """
+        for name in (source, destination):
+            if name not in self.machines:
+                raise KeyError(f"Unknown machine {name!r}")
+        self._edges[source].append(destination)
+
+    def tap(self, name: str) -> List[int]:
+        """
+        Record the output values of a machine
+
+        Args:
+            name (str): Name of the machine
+
+        Returns:
+            (list[int]): Output values, filled in while the network runs
+        """
+        return self.taps.setdefault(name, [])
+
+    async def run(self) -> Dict[str, List[int]]:
+        """
+        Run all the machines until they all halt
+
+        Returns:
+            (dict[str, list[int]]): Output values of the tapped machines
+        """
+        self.messages = 0
+        self._channels = {name: Channel(self.maxsize) for name in self.machines}
+        self._live = set(self.machines)
+        self._waiting = set()
+        self._writing = {}
+        tasks = [
+            asyncio.ensure_future(self._run_machine(name)) for name in self.machines
+        ]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+        return self.taps
+
+    async def _run_machine(self, name: str) -> None:
+        """
+        Task running one machine of the network
+
+        Args:
+            name (str): Name of the machine
+        """
+        machine = self.machines[name]
+        inbox = self._channels[name]
+        outboxes = [self._channels[destination] for destination in self._edges[name]]
+        tap = self.taps.get(name)
+        try:
+            while True:
+                for value in machine.run(until="input_needed"):
+                    self.messages += 1
+                    if tap is not None:
+                        tap.append(value)
+                    for outbox in outboxes:
+                        await self._send(name, outbox, value)
+                if machine.halted:
+                    break
+                if inbox.queue.empty():
+                    self._waiting.add(name)
+                    self._check_deadlock()
+                machine.feed_input(await inbox.queue.get())
+                self._waiting.discard(name)
+                # Take everything else that is already there in one go
+                while not inbox.queue.empty():
+                    machine.feed_input(inbox.queue.get_nowait())
+        finally:
+            inbox.close()
+            self._live.discard(name)
+            self._waiting.discard(name)
+            self._writing.pop(name, None)
+        self._check_deadlock()
+
+    async def _send(self, name: str, outbox: Channel, value: int) -> None:
+        """
+        Send a value from a machine, marking it as blocked while the channel is full
+
+        Args:
+            name   (str)    : Name of the writing machine
+            outbox (Channel): Channel to send to
+            value  (int)    : Value to send
+        """
+        try:
+            if outbox.queue.full() and not outbox.closed:
+                self._writing[name] = outbox
+                self._check_deadlock()
+            await outbox.put(value)
+        finally:
+            self._writing.pop(name, None)
+
+    def _check_deadlock(self) -> None:
+        """
+        Raise if every running machine waits on an empty channel, or on a full one
+        """
+        blocked = {name for name in self._waiting if self._channels[name].queue.empty()}
+        blocked.update(
+            name
+            for name, outbox in self._writing.items()
+            if outbox.queue.full() and not outbox.closed
+        )
+        if self._live and self._live <= blocked:
+            raise Deadlock(f"Machines {sorted(self._live)} are all blocked on channels")
+
+
+class NetworkStats(NamedTuple):
+    """
+    Aggregate statistics of a batch of network runs
+
+    Properties:
+        networks (int)  : Number of networks run
+        messages (int)  : Number of values produced by all the machines
+        seconds  (float): Wall time
+    """
+
+    networks: int
+    messages: int
+    seconds: float
+
+    @property
+    def networks_per_second(self) -> float:
+        return self.networks / self.seconds if self.seconds else 0.0
+
+    @property
+    def messages_per_second(self) -> float:
+        return self.messages / self.seconds if self.seconds else 0.0
+
+
+async def run_networks(
+    networks: Iterable[Network], concurrency: Optional[int] = 1000
+) -> NetworkStats:
+    """
+    Run many independent networks concurrently in the current event loop
+
+    Args:
+        networks    (Iterable[Network]): Networks to run; their results are in their
+                                         `taps`
+        concurrency (int?)             : Maximum number of networks running at once;
+                                         `None` for no limit
+
+    Returns:
+        (NetworkStats): Aggregate statistics
+    """
+    networks = list(networks)
+    semaphore = asyncio.Semaphore(concurrency or len(networks) or 1)
+
+    async def run_one(network: Network) -> None:
+        async with semaphore:
+            await network.run()
+
+    start = perf_counter()
+    await asyncio.gather(*(run_one(network) for network in networks))
+    seconds = perf_counter() - start
+    messages = sum(network.messages for network in networks)
+    return NetworkStats(len(networks), messages, seconds)
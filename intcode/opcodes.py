@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from enum import IntEnum
+from typing import Tuple
+
+
+class OP_CODES(IntEnum):
+    """
+    Enum for opcodes for better readability
+    """
+
+    ADD = 1
+    MUL = 2
+    INPUT = 3
+    OUTPUT = 4
+    JUMP_TRUE = 5
+    JUMP_FALSE = 6
+    LESS_THAN = 7
+    EQUAL = 8
+    ADJUST_REL_BASE = 9
+    END = 99
+
+
+class PARAM_TYPES(IntEnum):
+    """
+    Enum for parameter types for better readability
+    """
+
+    POSITION = 0
+    VALUE = 1
+    RELATIVE = 2
+
+
+def parse_op_code(op_code: int) -> Tuple[int, int, int, int]:
+    """
+    Parse opcodes into it's components: operation and parameter types
+
+    Args:
+        op_code (int): Full operation code
+
+    Returns:
+        (int)  : Operation (OP_CODES)
+        (int*3): Parameter 1-3 types (PARAM_TYPES)
+    """
+    # Get rid of everything beyond ten thousand's place
+    op_code %= 100000
+    # Parameter 3 type on ten-thousand's place
+    param3_type, op_code = divmod(op_code, 10000)
+    # Parameter 2 type on thousand's place
+    param2_type, op_code = divmod(op_code, 1000)
+    # Parameter 1 type on hundred's place
+    # Operation on ten's and one's place
+    param1_type, op = divmod(op_code, 100)
+    return op, param1_type, param2_type, param3_type
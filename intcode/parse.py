@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import re
+from array import array
+from pathlib import Path
+from typing import IO, Iterator, List, Optional, Union
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional; chunks are then parsed with `int`
+    numpy = None
+
+# Program text: path of a file, contents, or a stream to read from
+Source = Union[Path, str, bytes, IO[bytes], IO[str]]
+
+# Number of bytes read at once
+CHUNK_SIZE = 1 << 20
+
+# Values of 18 digits or fewer always fit in int64
+_LONG_VALUE = re.compile(rb"\d{19}")
+
+
+def _chunks(source: Source, chunk_size: int) -> Iterator[bytes]:
+    """
+    Read program text in chunks that each end right after a comma, except the last
+      one, so that no value is split between chunks
+
+    Args:
+        source     (Source): Program text
+        chunk_size (int)   : Number of bytes read at once
+
+    Yields:
+        (bytes): Chunks of text
+    """
+    if isinstance(source, bytes):
+        data = memoryview(source)
+        reads: Iterator[Union[bytes, str]] = (
+            data[start : start + chunk_size].tobytes()
+            for start in range(0, len(data), chunk_size)
+        )
+        yield from _split(reads)
+    elif isinstance(source, (Path, str)):
+        with open(source, "rb") as input_fp:
+            yield from _split(iter(lambda: input_fp.read(chunk_size), b""))
+    else:
+        stream = source
+        yield from _split(iter(lambda: stream.read(chunk_size), stream.read(0)))
+
+
+def _split(reads: Iterator[Union[bytes, str]]) -> Iterator[bytes]:
+    """
+    Cut raw reads after their last comma, carrying the rest over to the next one
+
+    Args:
+        reads (Iterator[bytes | str]): Raw reads; text streams give `str`
+
+    Yields:
+        (bytes): Chunks of text
+    """
+    rest = b""
+    for data in reads:
+        if isinstance(data, str):
+            data = data.encode("ascii")
+        data = rest + data
+        cut = data.rfind(b",") + 1
+        rest = data[cut:]
+        if cut:
+            yield data[:cut]
+    if rest.strip():
+        yield rest
+
+
+def _parse_vectorized(chunk: bytes) -> Optional[array[int]]:
+    """
+    Parse a chunk of text with NumPy, if all its values fit in int64
+
+    Args:
+        chunk (bytes): Chunk of text
+
+    Returns:
+        (array[int]?): Values; `None` if a value may not fit in int64
+    """
+    if _LONG_VALUE.search(chunk):
+        return None
+    text = chunk.decode("ascii").rstrip().rstrip(",")
+    values = numpy.fromstring(text, dtype=numpy.int64, sep=",")
+    if len(values) != text.count(",") + 1:
+        raise ValueError(f"Invalid program text near {text[:40]!r}")
+    cells: array[int] = array("q")
+    cells.frombytes(values.tobytes())
+    return cells
+
+
+def parse_program(
+    source: Source,
+    *,
+    chunk_size: int = CHUNK_SIZE,
+    vectorized: Optional[bool] = None,
+) -> Union[array[int], List[int]]:
+    """
+    Parse a comma-separated IntCode program, reading it in chunks
+    Values are emitted into an int64 array; if one does not fit in int64, the
+      values are moved into a list instead
+
+    Args:
+        source     (Source): Path of the program, its text, or a stream to read it
+                             from
+        chunk_size (int)   : Number of bytes read at once
+        vectorized (bool?) : Whether to parse chunks with NumPy; default if it is
+                             installed
+
+    Returns:
+        (array[int] | list[int]): Program codes
+    """
+    if vectorized is None:
+        vectorized = numpy is not None
+    elif vectorized and numpy is None:
+        raise ImportError("Vectorized parsing needs NumPy")
+    codes: Union[array[int], List[int]] = array("q")
+    for chunk in _chunks(source, chunk_size):
+        if vectorized and isinstance(codes, array):
+            cells = _parse_vectorized(chunk)
+            if cells is not None:
+                codes += cells
+                continue
+        tokens = chunk.split(b",")
+        # The separator ends the chunk, and the text may end with a line break
+        if not tokens[-1].strip():
+            tokens.pop()
+        length = len(codes)
+        try:
+            codes.extend(map(int, tokens))
+        except OverflowError:
+            del codes[length:]
+            codes = codes.tolist()
+            codes.extend(map(int, tokens))
+    return codes
@@ -0,0 +1,9 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+# Root of the repository, holding the puzzles of each day
+REPO_PATH = Path(__file__).resolve().parents[1]
+
+# Default program of the command-line tools: the BOOST program of Day 09
+DAY_09_PATH = REPO_PATH / "Day 09" / "02 - Sensor Boost Heavy" / "input.txt"
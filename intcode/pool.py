@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+if TYPE_CHECKING:
+    from multiprocessing.synchronize import Event
+
+S = TypeVar("S")
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Per-process state of a worker, set once by `_init_worker`: what the `setup` of the
+#   pool made, and the event telling the worker to stop
+_worker_state: Optional[Tuple[Any, Event]] = None
+
+
+def _init_worker(setup: Callable[..., Any], args: Tuple[Any, ...], stop: Event) -> None:
+    """
+    Set up the state of the worker process
+    """
+    global _worker_state
+    _worker_state = (setup(*args), stop)
+
+
+def _run_chunk(
+    run: Callable[[Any, Event, List[Any]], List[Any]], chunk: List[Any]
+) -> List[Any]:
+    """
+    Run a chunk of items in a worker process, with its state
+    """
+    assert _worker_state is not None
+    state, stop = _worker_state
+    return run(state, stop, chunk)
+
+
+def map_chunks(
+    setup: Callable[..., S],
+    args: Tuple[Any, ...],
+    run: Callable[[S, Event, List[T]], List[R]],
+    items: Iterable[T],
+    *,
+    workers: Optional[int] = None,
+    chunk_size: int,
+) -> Generator[List[R], None, None]:
+    """
+    Run chunks of items across a pool of processes, keeping a bounded number of
+      chunks in flight
+    Items are consumed lazily, so that `items` can be an unbounded generator; no
+      chunk is submitted once it ends, or once a worker sets the stop event. Closing
+      the iterator sets the stop event and cancels the chunks not started
+
+    Args:
+        setup      ((...) -> S)                    : Makes the state of a worker
+                                                     process from `args`, once per
+                                                     process
+        args       (tuple)                         : Arguments of `setup`
+        run        ((S, Event, list[T]) -> list[R]): Runs a chunk of items in a
+                                                     worker process, given its state
+                                                     and the stop event
+        items      (Iterable[T])                   : Items
+        workers    (int?)                          : Number of processes, default
+                                                     number of CPUs
+        chunk_size (int)                           : Number of items sent to a worker
+                                                     at once
+
+    Yields:
+        (list[R]): Results of each chunk, in completion order
+    """
+    workers = workers or os.cpu_count() or 1
+    context = multiprocessing.get_context()
+    stop = context.Event()
+    item_iter = iter(items)
+    chunks = iter(lambda: list(islice(item_iter, chunk_size)), [])
+
+    with ProcessPoolExecutor(
+        workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(setup, args, stop),
+    ) as pool:
+        pending: Set[Future[List[R]]] = {
+            pool.submit(_run_chunk, run, chunk) for chunk in islice(chunks, 2 * workers)
+        }
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+                if not stop.is_set():
+                    pending |= {
+                        pool.submit(_run_chunk, run, chunk)
+                        for chunk in islice(chunks, len(done))
+                    }
+        finally:
+            stop.set()
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from collections import Counter
+from time import perf_counter
+from typing import List, Tuple
+
+from .decode import fetch
+from .dispatch import StopExecution
+from .machine import Machine
+from .memory import PAGE_SIZE
+from .opcodes import OP_CODES
+
+# Operations that may jump
+_JUMPS = {OP_CODES.JUMP_TRUE, OP_CODES.JUMP_FALSE}
+
+
+class Profile:
+    """
+    Counters collected while running machines with profiling enabled; see
+      `Machine(profile=...)`
+    Calls are told apart heuristically: a jump taken right after the relative base
+      grows enters a subroutine, and one taken right after it shrinks returns from it
+
+    Public Properties:
+        ops          (Counter[int])            : Instructions executed per operation
+        addresses    (Counter[int])            : Instructions executed per address
+        stacks       (Counter[tuple[int, ...]]): Instructions executed per operation,
+                                                 keyed by the entry addresses of the
+                                                 subroutines called followed by the
+                                                 operation
+        inputs       (int)                     : Number of values consumed by op 3
+        outputs      (int)                     : Number of values produced by op 4
+        memory_cells (int)                     : Most cells allocated at once
+        seconds      (float)                   : Wall time spent executing
+    """
+
+    def __init__(self) -> None:
+        self.ops: Counter[int] = Counter()
+        self.addresses: Counter[int] = Counter()
+        self.stacks: Counter[Tuple[int, ...]] = Counter()
+        self.inputs = 0
+        self.outputs = 0
+        self.memory_cells = 0
+        self.seconds = 0.0
+
+    @property
+    def instructions(self) -> int:
+        """
+        Total number of instructions executed
+        """
+        return sum(self.ops.values())
+
+    def execute(self, machine: Machine) -> None:
+        """
+        Execute a machine instruction by instruction until the program halts or needs
+          input that is not available, counting everything on the way
+
+        Args:
+            machine (Machine): Machine to run
+        """
+        ops = self.ops
+        addresses = self.addresses
+        stacks = self.stacks
+        memory = machine.memory
+        dense = memory.dense
+        # Entry addresses of the subroutines being executed
+        calls: List[int] = []
+        # Direction of the last change of the relative base not yet followed by a jump
+        pending = 0
+        pointer = machine.pointer
+        start = perf_counter()
+        try:
+            while True:
+                op = memory[pointer] % 100
+                handler, a, b, c, length = fetch(memory, pointer)
+                rel_base = machine.rel_base
+                next_pointer = handler(machine, memory, dense, pointer, a, b, c)
+                ops[op] += 1
+                addresses[pointer] += 1
+                stacks[(*calls, op)] += 1
+                if op == OP_CODES.ADJUST_REL_BASE:
+                    delta = machine.rel_base - rel_base
+                    pending = (delta > 0) - (delta < 0)
+                elif op in _JUMPS and next_pointer != pointer + length and pending:
+                    if pending > 0:
+                        calls.append(next_pointer)
+                    elif calls:
+                        calls.pop()
+                    pending = 0
+                elif op == OP_CODES.INPUT:
+                    self.inputs += 1
+                elif op == OP_CODES.OUTPUT:
+                    self.outputs += 1
+                pointer = next_pointer
+        except StopExecution:
+            # Op 99 halts by raising once executed; op 3 raises without executing
+            #   when no input is queued
+            if op == OP_CODES.END:
+                ops[op] += 1
+                addresses[pointer] += 1
+                stacks[(*calls, op)] += 1
+            machine.pointer = pointer
+        finally:
+            self.seconds += perf_counter() - start
+            cells = len(memory.dense) + PAGE_SIZE * len(memory.pages)
+            self.memory_cells = max(self.memory_cells, cells)
+
+    def report(self, top: int = 20) -> str:
+        """
+        Format the counters as a flat report
+
+        Args:
+            top (int): Number of hottest addresses to list
+
+        Returns:
+            (str): Report
+        """
+        total = self.instructions or 1
+        rate = self.instructions / self.seconds if self.seconds else 0.0
+        lines = [
+            f"instructions : {self.instructions:,}",
+            f"wall time    : {self.seconds:.6f} s ({rate:,.0f} instructions/s)",
+            f"inputs       : {self.inputs:,}",
+            f"outputs      : {self.outputs:,}",
+            f"memory       : {self.memory_cells:,} cells",
+            "",
+            "operation         count       %",
+        ]
+        for op, count in self.ops.most_common():
+            name = OP_CODES(op).name
+            lines.append(f"{name:<15} {count:>9,} {100 * count / total:>6.2f}")
+        lines += ["", "address           count       %"]
+        for address, count in self.addresses.most_common(top):
+            lines.append(f"{address:<15} {count:>9,} {100 * count / total:>6.2f}")
+        return "\n".join(lines)
+
+    def collapsed(self) -> str:
+        """
+        Format the call stacks in the collapsed-stack format of flame graph tools:
+          one line per stack, frames separated by semicolons, then the count
+
+        Returns:
+            (str): Collapsed stacks
+        """
+        lines = []
+        for stack, count in sorted(self.stacks.items()):
+            *calls, op = stack
+            frames = ["main", *(f"sub_{address}" for address in calls)]
+            frames.append(OP_CODES(op).name)
+            lines.append(f"{';'.join(frames)} {count}")
+        return "\n".join(lines) + "\n"
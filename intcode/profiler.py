@@ -0,0 +1,37 @@
+"""
+Profile an IntCode program: instruction counts per operation and per address, call
+  stacks, memory high-water mark, I/O counts and wall time
+
+Usage:
+    python -m intcode.profiler [PROGRAM] [-i INPUT ...] [-o COLLAPSED] [-n TOP]
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from .machine import Machine
+from .parse import parse_program
+from .paths import DAY_09_PATH
+from .profile import Profile
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("program", nargs="?", type=Path, default=DAY_09_PATH)
+    parser.add_argument("-i", "--input", type=int, nargs="*", default=[2])
+    parser.add_argument("-o", "--collapsed", type=Path, default=None)
+    parser.add_argument("-n", "--top", type=int, default=20)
+    args = parser.parse_args()
+
+    profile = Profile()
+    machine = Machine(parse_program(args.program), args.input, profile=profile)
+    machine.run()
+    print(profile.report(args.top))
+    if args.collapsed is not None:
+        args.collapsed.write_text(profile.collapsed())
+
+
+if __name__ == "__main__":
+    main()
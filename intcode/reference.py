@@ -0,0 +1,213 @@
+"""
+The original per-day IntCode interpreter, kept as the baseline for benchmarks and
+  result comparisons. Do not use it for anything else; use `Machine` instead
+"""
+
+from __future__ import annotations
+
+from typing import Generator, Iterable, List, Optional
+
+from .opcodes import OP_CODES, PARAM_TYPES, parse_op_code
+
+
+class Code_List(list):  # pyright: reportMissingTypeArgument=false
+    """
+    Basically a list with iterator capabilities
+
+    Properties:
+        pointer  {int}: Current pointer for iterator
+        rel_base {int}: Relative base for `PARAM_TYPES.RELATIVE` parameters
+    """
+
+    def __init__(self, it: Iterable[int]) -> None:
+        super().__init__(it)  # pyright: reportUnknownMemberType=false
+        self.pointer = 0
+        self.rel_base = 0
+
+    def __next__(self) -> int:
+        curr_pointer = self.pointer
+        self.pointer += 1
+        if 0 <= curr_pointer < len(self):
+            return self[curr_pointer]  # pyright: reportUnknownVariableType=false
+        else:
+            raise StopIteration()
+
+    def __getitem__(self, index: int) -> int:
+        """
+        Only allows access of 1 element
+        Disallows negative indices
+        Allows access outside original data (default 0)
+        """
+        if index < 0:
+            raise IndexError(f"Index cannot be negative; got {index}")
+        elif index < len(self):
+            return super().__getitem__(index)
+        else:
+            self += [0] * (index + 1 - len(self))
+            return 0
+
+    def __setitem__(self, index: int, value: int) -> None:
+        """
+        Only allows access of 1 element
+        Disallows negative indices
+        Allows access outside original data (default 0)
+        """
+        if index < 0:
+            raise IndexError(f"Index cannot be negative; got {index}")
+        elif index < len(self):
+            return super().__setitem__(index, value)
+        else:
+            self += [0] * (index - len(self))
+            self += [value]
+
+
+def _get_param_value(codes: Code_List, param_type: int) -> int:
+    """
+    Get next code and try to parse it as parameter value
+
+    Args:
+        codes      (Code_List): Iterator/List of the integer codes
+        param_type (int)      : Parameter type (PARAM_TYPES)
+
+    Returns:
+        (int): Parameter value
+    """
+    value = next(codes)
+    # If parameter is a position pointer, access value at corresponding memory space
+    if param_type == PARAM_TYPES.POSITION:
+        return codes[value]
+    # If parameter is a value, just return it
+    elif param_type == PARAM_TYPES.VALUE:
+        return value
+    # If parameter is a relative pointer, access value at corresponding memory space
+    elif param_type == PARAM_TYPES.RELATIVE:
+        return codes[codes.rel_base + value]
+    else:
+        raise ValueError(f"{param_type=} unknown param type")
+
+
+def _get_param_pointer(codes: Code_List, param_type: int) -> int:
+    """
+    Get next code and try to parse it as parameter pointer
+    Note that the type cannot be `PARAM_TYPES.VALUE` (1)
+
+    Args:
+        codes      (Code_List): Iterator/List of the integer codes
+        param_type (int)      : Parameter type (PARAM_TYPES)
+
+    Returns:
+        (int): Parameter pointer
+    """
+    value = next(codes)
+    # If parameter is a position pointer, access value at corresponding memory space
+    if param_type == PARAM_TYPES.POSITION:
+        return value
+    # If parameter is a relative pointer, access value at corresponding memory space
+    elif param_type == PARAM_TYPES.RELATIVE:
+        return codes.rel_base + value
+    else:
+        raise ValueError(f"{param_type=} unknown or invalid param type")
+
+
+def intcode_calculation(codes: Code_List) -> Generator[Optional[int], int, None]:
+    """
+    IntCode computer coroutine
+
+    Args:
+        codes (Code_List): Initial code
+
+    Sends:
+        inp (int): Outside input for op 3
+
+    Yields:
+        (int?): Output value; `None` when input is needed
+    """
+    while True:
+        op, param1_type, param2_type, param3_type = parse_op_code(next(codes))
+        # End program
+        if op == OP_CODES.END:
+            break
+        # Addition: Gets 2 params, add, and save result to space pointed to by 3rd param
+        if op == OP_CODES.ADD:
+            param1 = _get_param_value(codes, param1_type)
+            param2 = _get_param_value(codes, param2_type)
+            param3 = _get_param_pointer(codes, param3_type)
+            codes[param3] = param1 + param2
+        # Multiplication: Gets 2 params, multiply, and save result to space pointed to by
+        #   3rd param
+        elif op == OP_CODES.MUL:
+            param1 = _get_param_value(codes, param1_type)
+            param2 = _get_param_value(codes, param2_type)
+            param3 = _get_param_pointer(codes, param3_type)
+            codes[param3] = param1 * param2
+        # Input: Gets outside input and save result to space pointed to by 1st param
+        elif op == OP_CODES.INPUT:
+            inp: int = yield None
+            param1 = _get_param_pointer(codes, param1_type)
+            codes[param1] = inp
+        # Output: Gets 1 param and yield it
+        elif op == OP_CODES.OUTPUT:
+            param1 = _get_param_value(codes, param1_type)
+            yield param1
+        # Jump if True: Gets 2 params, check if the 1st is non-zero, and jump if true
+        elif op == OP_CODES.JUMP_TRUE:
+            param1 = _get_param_value(codes, param1_type)
+            param2 = _get_param_value(codes, param2_type)
+            if param1:
+                codes.pointer = param2
+        # Jump if False: Gets 2 params, check if the 1st is zero, and jump if true
+        elif op == OP_CODES.JUMP_FALSE:
+            param1 = _get_param_value(codes, param1_type)
+            param2 = _get_param_value(codes, param2_type)
+            if not param1:
+                codes.pointer = param2
+        # Less than: Gets 2 params, check if the 1st is less than the 2nd, and save result
+        #   to space pointed to by 3rd param
+        elif op == OP_CODES.LESS_THAN:
+            param1 = _get_param_value(codes, param1_type)
+            param2 = _get_param_value(codes, param2_type)
+            param3 = _get_param_pointer(codes, param3_type)
+            codes[param3] = int(param1 < param2)
+        # Equal: Gets 2 params, check if the 1st equals the 2nd, and save result to space
+        #   pointed to by 3rd param
+        elif op == OP_CODES.EQUAL:
+            param1 = _get_param_value(codes, param1_type)
+            param2 = _get_param_value(codes, param2_type)
+            param3 = _get_param_pointer(codes, param3_type)
+            codes[param3] = int(param1 == param2)
+        # Adjust relative base: Gets 1 param and add to `rel_base`
+        elif op == OP_CODES.ADJUST_REL_BASE:
+            param1 = _get_param_value(codes, param1_type)
+            codes.rel_base += param1
+        else:
+            raise ValueError(f"{op=} unknown operation")
+
+
+def run_reference(codes: Iterable[int], inputs: Iterable[int] = ()) -> List[int]:
+    """
+    Run a program to completion on the reference interpreter
+
+    Args:
+        codes  (Iterable[int]): Initial code
+        inputs (Iterable[int]): Input values, in order
+
+    Returns:
+        (list[int]): Output values, in order
+    """
+    inputs_iter = iter(inputs)
+    outputs: List[int] = []
+    compy = intcode_calculation(Code_List(codes))
+    try:
+        value = next(compy)
+        while True:
+            if value is None:
+                inp = next(inputs_iter, None)
+                if inp is None:
+                    raise ValueError("Program needs more input than given")
+                value = compy.send(inp)
+            else:
+                outputs.append(value)
+                value = next(compy)
+    except StopIteration:
+        pass
+    return outputs
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+from collections import defaultdict, deque
+from time import perf_counter
+from typing import Callable, DefaultDict, Deque, Dict, List, Optional, Set
+
+from .machine import Machine
+from .network import Deadlock
+
+
+class MachineStats:
+    """
+    Counters of one machine run by a scheduler
+
+    Public Properties:
+        instructions (int)  : Number of instructions executed
+        slices       (int)  : Number of time slices given
+        blocked      (int)  : Number of times it blocked on input
+        inputs       (int)  : Number of values delivered to it
+        outputs      (int)  : Number of values it produced
+        seconds      (float): Wall time spent executing it
+    """
+
+    def __init__(self) -> None:
+        self.instructions = 0
+        self.slices = 0
+        self.blocked = 0
+        self.inputs = 0
+        self.outputs = 0
+        self.seconds = 0.0
+
+    @property
+    def instructions_per_second(self) -> float:
+        return self.instructions / self.seconds if self.seconds else 0.0
+
+
+class Scheduler:
+    """
+    Run many IntCode machines in the current thread, round-robin, each for at most a
+      time slice of instructions at a time
+    Each output value of a machine is delivered to every machine it is connected to.
+      Machines blocked on input are skipped until a value is delivered to them; once
+      all the machines still running are blocked, the scheduler is idle
+
+    Args:
+        time_slice (int): Maximum number of instructions run per turn
+
+    Public Properties:
+        machines     (dict[str, Machine])     : Machines, by name
+        stats        (dict[str, MachineStats]): Counters, by machine name
+        taps         (dict[str, list[int]])   : Output values of the tapped machines
+        instructions (int)                    : Number of instructions executed by
+                                                all the machines
+        seconds      (float)                  : Wall time spent running
+    """
+
+    def __init__(self, time_slice: int = 10_000) -> None:
+        if time_slice < 1:
+            raise ValueError(f"{time_slice=} must be positive")
+        self.time_slice = time_slice
+        self.machines: Dict[str, Machine] = {}
+        self.stats: Dict[str, MachineStats] = {}
+        self.taps: Dict[str, List[int]] = {}
+        self.instructions = 0
+        self.seconds = 0.0
+        self._edges: DefaultDict[str, List[str]] = defaultdict(list)
+        # Machines that may run, in turn order, and the same as a set
+        self._ready: Deque[str] = deque()
+        self._queued: Set[str] = set()
+
+    @property
+    def instructions_per_second(self) -> float:
+        return self.instructions / self.seconds if self.seconds else 0.0
+
+    @property
+    def idle(self) -> bool:
+        """
+        Whether no machine can run until a value is delivered to one of them
+        """
+        return not self._ready
+
+    @property
+    def halted(self) -> bool:
+        """
+        Whether all the machines have halted
+        """
+        return all(machine.halted for machine in self.machines.values())
+
+    def add(self, name: str, machine: Machine) -> None:
+        """
+        Add a machine to the scheduler
+
+        Args:
+            name    (str)    : Name of the machine
+            machine (Machine): Machine, with its initial input already queued; it
+                               must run on the dispatch table, as time slices are
+                               counted in instructions (see `Machine.sliceable`)
+        """
+        if name in self.machines:
+            raise ValueError(f"Machine {name!r} already exists")
+        if not machine.sliceable:
+            raise ValueError(
+                f"Machine {name!r} uses jit, profile or memo, which cannot be run "
+                "in time slices"
+            )
+        self.machines[name] = machine
+        self.stats[name] = MachineStats()
+        self._wake(name)
+
+    def connect(self, source: str, destination: str) -> None:
+        """
+        Deliver the output values of a machine to another one
+
+        Args:
+            source      (str): Name of the writing machine
+            destination (str): Name of the reading machine
+        """
+        for name in (source, destination):
+            if name not in self.machines:
+                raise KeyError(f"Unknown machine {name!r}")
+        self._edges[source].append(destination)
+
+    def tap(self, name: str) -> List[int]:
+        """
+        Record the output values of a machine
+
+        Args:
+            name (str): Name of the machine
+
+        Returns:
+            (list[int]): Output values, filled in while the machines run
+        """
+        return self.taps.setdefault(name, [])
+
+    def send(self, name: str, *values: int) -> None:
+        """
+        Deliver values to a machine from outside, waking it up
+
+        Args:
+            name    (str): Name of the machine
+            *values (int): Input values, in order
+        """
+        if not self.machines[name].halted:
+            self.machines[name].feed_input(*values)
+            self.stats[name].inputs += len(values)
+            self._wake(name)
+
+    def run(
+        self, on_idle: Optional[Callable[[Scheduler], bool]] = None
+    ) -> Dict[str, List[int]]:
+        """
+        Run the machines until they all halt
+
+        Args:
+            on_idle ((Scheduler) -> bool)?: Called whenever the scheduler is idle; it
+                                            may `send` values, and returns whether to
+                                            go on. Being idle with nothing sent is
+                                            a deadlock
+
+        Returns:
+            (dict[str, list[int]]): Output values of the tapped machines
+        """
+        ready = self._ready
+        start = perf_counter()
+        try:
+            while True:
+                while ready:
+                    self._run_slice(ready.popleft())
+                live = [
+                    name
+                    for name, machine in self.machines.items()
+                    if not machine.halted
+                ]
+                if not live:
+                    break
+                if on_idle is not None:
+                    if not on_idle(self):
+                        break
+                    if ready:
+                        continue
+                raise Deadlock(f"Machines {sorted(live)} all wait for input")
+        finally:
+            self.seconds += perf_counter() - start
+        return self.taps
+
+    def _run_slice(self, name: str) -> None:
+        """
+        Run a machine for one time slice, and deliver what it outputs
+
+        Args:
+            name (str): Name of the machine
+        """
+        self._queued.discard(name)
+        machine = self.machines[name]
+        stats = self.stats[name]
+        start = perf_counter()
+        executed = machine.run_for(self.time_slice)
+        stats.seconds += perf_counter() - start
+        stats.instructions += executed
+        stats.slices += 1
+        self.instructions += executed
+        if machine.outputs:
+            values = machine.drain_output()
+            stats.outputs += len(values)
+            if name in self.taps:
+                self.taps[name] += values
+            for destination in self._edges[name]:
+                self.send(destination, *values)
+        if executed == self.time_slice:
+            # Preempted; back to the end of the line
+            self._wake(name)
+        elif not machine.halted:
+            stats.blocked += 1
+            # Values may have been delivered to itself
+            if machine.inputs:
+                self._wake(name)
+
+    def _wake(self, name: str) -> None:
+        """
+        Queue a machine to run, unless it already is
+
+        Args:
+            name (str): Name of the machine
+        """
+        if name not in self._queued:
+            self._queued.add(name)
+            self._ready.append(name)
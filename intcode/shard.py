@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+from itertools import takewhile
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .image import cache_program, cached_image
+from .machine import Machine
+from .memory import Memory
+from .pool import map_chunks
+from .scheduler import Scheduler
+
+if TYPE_CHECKING:
+    from multiprocessing.synchronize import Event
+
+# Kinds of networks run per job:
+#   "machine"   : a single machine, the job being its input values
+#   "amplifiers": amplifiers in series, the job being their phase settings
+#   "feedback"  : amplifiers in a feedback loop, the job being their phase settings
+NETWORKS = ("machine", "amplifiers", "feedback")
+
+# Reductions of the results of all the jobs
+REDUCTIONS = ("max", "min", "first")
+
+
+class ShardResult(NamedTuple):
+    """
+    Result of one job of a sharded run
+
+    Properties:
+        position (int)            : Position of the job
+        job      (tuple[int, ...]): Input values or phase settings of the job
+        outputs  (list[int])      : Output values of the network, in order
+    """
+
+    position: int
+    job: Tuple[int, ...]
+    outputs: List[int]
+
+    @property
+    def value(self) -> int:
+        """
+        Last output value: the result of a machine, or the thruster signal
+        """
+        return self.outputs[-1]
+
+
+class _WorkerState(NamedTuple):
+    """
+    Per-process state of a shard worker, made once by `_setup_worker`
+    """
+
+    memory: Memory
+    network: str
+    reduce: str
+
+
+def run_network(memory: Memory, network: str, job: Sequence[int]) -> List[int]:
+    """
+    Run the network of one job
+
+    Args:
+        memory  (Memory)       : Program image; not modified
+        network (str)          : Kind of network (see `NETWORKS`)
+        job     (Sequence[int]): Input values or phase settings
+
+    Returns:
+        (list[int]): Output values of the network, in order
+    """
+    if network == "machine":
+        machine = Machine(memory, job)
+        if not machine.run():
+            raise ValueError(f"Program with inputs {tuple(job)} needs more input")
+        return machine.drain_output()
+    if network not in NETWORKS:
+        raise ValueError(f"{network=} unknown network")
+    if not job:
+        raise ValueError("Amplifier networks need at least 1 phase setting")
+    scheduler = Scheduler()
+    names = [str(i) for i in range(len(job))]
+    for name, phase in zip(names, job):
+        scheduler.add(name, Machine(memory, [phase]))
+    scheduler.send(names[0], 0)
+    for source, destination in zip(names, names[1:]):
+        scheduler.connect(source, destination)
+    if network == "feedback":
+        scheduler.connect(names[-1], names[0])
+    outputs = scheduler.tap(names[-1])
+    scheduler.run()
+    return outputs
+
+
+def _setup_worker(
+    digest: str, cache: Optional[Path], network: str, reduce: str
+) -> _WorkerState:
+    """
+    Map the program image from the cache in the worker process
+    """
+    return _WorkerState(cached_image(digest, cache).memory(), network, reduce)
+
+
+def _run_chunk(
+    state: _WorkerState, stop: Event, jobs: List[Tuple[int, Tuple[int, ...]]]
+) -> List[ShardResult]:
+    """
+    Run a chunk of jobs in a worker process
+
+    Args:
+        state (_WorkerState)                    : State of the worker
+        stop  (Event)                           : Set once the run is abandoned
+        jobs  (list[tuple[int, tuple[int, ...]]]): Jobs, with their positions
+
+    Returns:
+        (list[ShardResult]): Results; only the best one for "max" and "min"
+    """
+    results: List[ShardResult] = []
+    for position, job in jobs:
+        # The parent stopped
+        if stop.is_set():
+            break
+        outputs = run_network(state.memory, state.network, job)
+        results.append(ShardResult(position, job, outputs))
+    if state.reduce != "first" and results:
+        return [_best(results, state.reduce)]
+    return results
+
+
+def _best(results: Iterable[ShardResult], reduce: str) -> ShardResult:
+    """
+    Get the result with the largest or smallest value, or the earliest one; the
+      earliest job on ties
+
+    Args:
+        results (Iterable[ShardResult]): Results
+        reduce  (str)                  : "max", "min", or "first"
+
+    Returns:
+        (ShardResult): Best result
+    """
+    if reduce == "max":
+        return max(results, key=lambda result: (result.value, -result.position))
+    if reduce == "min":
+        return min(results, key=lambda result: (result.value, result.position))
+    return min(results, key=lambda result: result.position)
+
+
+def run_sharded(
+    codes: Sequence[int],
+    jobs: Iterable[Sequence[int]],
+    reduce: str = "max",
+    *,
+    network: str = "machine",
+    match: Optional[Callable[[ShardResult], bool]] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 16,
+    cache: Optional[Path] = None,
+) -> Optional[ShardResult]:
+    """
+    Run independent networks of the same program across a pool of processes, and
+      reduce their results
+    The program is written to the image cache once; workers only get its hash and
+      map it, then only the jobs are sent to them. Jobs are consumed lazily, so that
+      `jobs` can be an unbounded generator
+
+    Args:
+        codes      (Sequence[int])          : Program codes
+        jobs       (Iterable[Sequence[int]]): Input values or phase settings, one
+                                              network per job
+        reduce     (str)                    : "max" or "min" for the result with the
+                                              largest or smallest value, earliest job
+                                              on ties; "first" for the result of the
+                                              earliest job that `match`es. Once a
+                                              match is found, no more jobs are sent,
+                                              and the earlier ones are finished
+        network    (str)                    : Kind of network (see `NETWORKS`)
+        match      ((ShardResult) -> bool)? : Condition of "first"; called in this
+                                              process
+        workers    (int?)                   : Number of processes, default number of
+                                              CPUs
+        chunk_size (int)                    : Number of jobs sent to a worker at once
+        cache      (Path?)                  : Directory of the cached images, default
+                                              `$INTCODE_CACHE`, or `intcode` in the
+                                              user's cache directory
+
+    Returns:
+        (ShardResult?): Reduced result; `None` if there is no job, or no match
+    """
+    if reduce not in REDUCTIONS:
+        raise ValueError(f"{reduce=} unknown reduction")
+    if network not in NETWORKS:
+        raise ValueError(f"{network=} unknown network")
+    if reduce == "first" and match is None:
+        raise ValueError('reduce="first" needs a match condition')
+    digest = cache_program(codes, cache)
+    best: Optional[ShardResult] = None
+    # Once a match is found, no more jobs are sent; the chunks in flight hold all
+    #   the earlier ones, and are finished
+    positioned = takewhile(
+        lambda _: reduce != "first" or best is None,
+        enumerate(tuple(job) for job in jobs),
+    )
+    chunks = map_chunks(
+        _setup_worker,
+        (digest, cache, network, reduce),
+        _run_chunk,
+        positioned,
+        workers=workers,
+        chunk_size=chunk_size,
+    )
+    try:
+        for results in chunks:
+            if match is not None and reduce == "first":
+                results = [result for result in results if match(result)]
+            if results:
+                best = _best(results + ([] if best is None else [best]), reduce)
+    finally:
+        chunks.close()
+    return best
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .machine import Machine
+from .memory import Memory
+from .pool import map_chunks
+
+if TYPE_CHECKING:
+    from multiprocessing.synchronize import Event
+
+# Memory patch applied before a run: address -> value
+Patch = Mapping[int, int]
+
+
+class SweepResult(NamedTuple):
+    """
+    Result of one run of a sweep
+
+    Properties:
+        patch   (dict[int, int]) : Memory patch the run started with
+        outputs (list[int])      : Output values, in order
+        cells   (tuple[int, ...]): Values of the `read` cells once the program halted
+    """
+
+    patch: Dict[int, int]
+    outputs: List[int]
+    cells: Tuple[int, ...]
+
+
+class _WorkerState(NamedTuple):
+    """
+    Per-process state of a sweep worker, made once by `_setup_worker`
+    """
+
+    memory: Memory
+    inputs: Tuple[int, ...]
+    read: Tuple[int, ...]
+    target: Optional[Dict[int, int]]
+
+
+def run_patched(
+    memory: Memory, patch: Patch, inputs: Iterable[int], read: Sequence[int]
+) -> SweepResult:
+    """
+    Run a program once with a memory patch applied
+
+    Args:
+        memory (Memory)       : Program image; not modified
+        patch  (Patch)        : Memory patch
+        inputs (Iterable[int]): Input values, in order
+        read   (Sequence[int]): Addresses of the cells to report once halted
+
+    Returns:
+        (SweepResult): Result of the run
+    """
+    machine = Machine(memory, inputs)
+    for address, value in patch.items():
+        machine.memory[address] = value
+    if not machine.run():
+        raise ValueError(f"Program with {patch=} needs more input than given")
+    cells = tuple(machine.memory[address] for address in read)
+    return SweepResult(dict(patch), machine.drain_output(), cells)
+
+
+def _setup_worker(
+    codes: Sequence[int],
+    inputs: Tuple[int, ...],
+    read: Tuple[int, ...],
+    target: Optional[Dict[int, int]],
+) -> _WorkerState:
+    """
+    Keep the program image and sweep settings in the worker process
+    """
+    return _WorkerState(Memory(codes), inputs, read, target)
+
+
+def _run_chunk(
+    state: _WorkerState, stop: Event, patches: List[Dict[int, int]]
+) -> List[SweepResult]:
+    """
+    Run a chunk of patches in a worker process
+
+    Args:
+        state   (_WorkerState)        : State of the worker
+        stop    (Event)               : Set once a match is found
+        patches (list[dict[int, int]]): Memory patches
+
+    Returns:
+        (list[SweepResult]): Results; only the matching ones if there is a target
+    """
+    results: List[SweepResult] = []
+    for patch in patches:
+        # Another worker found a match
+        if stop.is_set():
+            break
+        result = run_patched(state.memory, patch, state.inputs, state.read)
+        if state.target is None:
+            results.append(result)
+        elif all(
+            result.cells[state.read.index(address)] == value
+            for address, value in state.target.items()
+        ):
+            stop.set()
+            results.append(result)
+            break
+    return results
+
+
+def sweep(
+    codes: Sequence[int],
+    patches: Iterable[Patch],
+    *,
+    inputs: Iterable[int] = (),
+    read: Iterable[int] = (),
+    target: Optional[Patch] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 256,
+) -> Iterator[SweepResult]:
+    """
+    Run a program once per memory patch, across a pool of processes
+    The program image is sent once to each worker, and patches are consumed lazily
+      so that `patches` can be an unbounded generator
+
+    Args:
+        codes      (Sequence[int])  : Program codes
+        patches    (Iterable[Patch]): Memory patches, one per run
+        inputs     (Iterable[int])  : Input values of every run, in order
+        read       (Iterable[int])  : Addresses of the cells to report once halted
+        target     (Patch?)         : If given, cell values to look for; only the
+                                      first run with matching `read` cells is
+                                      yielded, and all workers are stopped then
+        workers    (int?)           : Number of processes, default number of CPUs
+        chunk_size (int)            : Number of runs sent to a worker at once
+
+    Yields:
+        (SweepResult): Results, in completion order
+    """
+    read = tuple(read)
+    if target is not None:
+        target = dict(target)
+        read += tuple(address for address in target if address not in read)
+    chunks = map_chunks(
+        _setup_worker,
+        (list(codes), tuple(inputs), read, target),
+        _run_chunk,
+        (dict(patch) for patch in patches),
+        workers=workers,
+        chunk_size=chunk_size,
+    )
+    try:
+        for results in chunks:
+            for result in results:
+                yield result
+                if target is not None:
+                    return
+    finally:
+        chunks.close()
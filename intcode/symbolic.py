@@ -0,0 +1,374 @@
+from __future__ import annotations
+
+from itertools import product
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .opcodes import OP_CODES, PARAM_TYPES, parse_op_code
+from .sweep import sweep
+
+# Product of symbols, as the sorted addresses of their cells (with repetition)
+Monomial = Tuple[int, ...]
+
+
+class NotSymbolic(Exception):
+    """
+    Raised when a program cannot be evaluated symbolically: a symbolic value is used
+      as a write address, a jump condition or target, a comparison operand, or an
+      opcode
+    """
+
+
+class Poly:
+    """
+    Polynomial with integer coefficients over the initial values of some cells
+
+    Args:
+        terms (dict[Monomial, int]): Coefficient of each monomial; `()` is the
+                                     constant term
+
+    Properties:
+        terms (dict[Monomial, int]): Non-zero coefficient of each monomial
+    """
+
+    def __init__(self, terms: Mapping[Monomial, int]) -> None:
+        self.terms = {monomial: coef for monomial, coef in terms.items() if coef}
+
+    @classmethod
+    def symbol(cls, address: int) -> Poly:
+        """
+        Make the polynomial of the initial value of a cell
+
+        Args:
+            address (int): Address of the cell
+
+        Returns:
+            (Poly): The polynomial `x_address`
+        """
+        return cls({(address,): 1})
+
+    @property
+    def degree(self) -> int:
+        """
+        Total degree of the polynomial; 0 for constants, including 0
+        """
+        return max((len(monomial) for monomial in self.terms), default=0)
+
+    def __add__(self, other: Union[Poly, int]) -> Poly:
+        if not isinstance(other, (Poly, int)):
+            return NotImplemented
+        terms = dict(self.terms)
+        for monomial, coef in _terms(other).items():
+            terms[monomial] = terms.get(monomial, 0) + coef
+        return Poly(terms)
+
+    __radd__ = __add__
+
+    def __mul__(self, other: Union[Poly, int]) -> Poly:
+        if not isinstance(other, (Poly, int)):
+            return NotImplemented
+        terms: Dict[Monomial, int] = {}
+        for monomial1, coef1 in self.terms.items():
+            for monomial2, coef2 in _terms(other).items():
+                monomial = tuple(sorted(monomial1 + monomial2))
+                terms[monomial] = terms.get(monomial, 0) + coef1 * coef2
+        return Poly(terms)
+
+    __rmul__ = __mul__
+
+    def __call__(self, values: Mapping[int, int]) -> int:
+        """
+        Evaluate the polynomial
+
+        Args:
+            values (Mapping[int, int]): Initial value of each symbolic cell
+
+        Returns:
+            (int): Value of the polynomial
+        """
+        total = 0
+        for monomial, coef in self.terms.items():
+            for address in monomial:
+                coef *= values[address]
+            total += coef
+        return total
+
+    def __repr__(self) -> str:
+        if not self.terms:
+            return "0"
+        return " + ".join(
+            "*".join([str(coef)] + [f"x{address}" for address in monomial])
+            for monomial, coef in sorted(self.terms.items())
+        )
+
+
+class _Unknown:
+    """
+    Value read from a symbolic address. It poisons everything computed from it, and
+      is only an error if it ends up being used
+    """
+
+    def __add__(self, other: object) -> _Unknown:
+        return self
+
+    __radd__ = __mul__ = __rmul__ = __add__
+
+    def __repr__(self) -> str:
+        return "?"
+
+
+UNKNOWN = _Unknown()
+
+# A cell value: concrete, a polynomial of the symbolic cells, or unknown
+Expr = Union[int, Poly, _Unknown]
+
+
+def _terms(value: Union[Poly, int]) -> Dict[Monomial, int]:
+    """
+    Get the terms of a known value as a polynomial
+
+    Args:
+        value (Poly | int): Value
+
+    Returns:
+        (dict[Monomial, int]): Coefficient of each monomial
+    """
+    if isinstance(value, Poly):
+        return value.terms
+    return {(): value}
+
+
+def _simplify(value: Expr) -> Expr:
+    """
+    Turn constant polynomials back into `int`
+
+    Args:
+        value (Expr): Value
+
+    Returns:
+        (Expr): `int` if the value is constant, `value` otherwise
+    """
+    if isinstance(value, Poly) and value.degree == 0:
+        return value.terms.get((), 0)
+    return value
+
+
+def _concrete(value: Expr) -> int:
+    """
+    Get a value that has to be concrete
+
+    Args:
+        value (Expr): Value
+
+    Returns:
+        (int): The value
+    """
+    if not isinstance(value, int):
+        raise NotSymbolic(f"{value=} is used where a concrete value is needed")
+    return value
+
+
+class SymbolicResult(NamedTuple):
+    """
+    Result of a symbolic run
+
+    Properties:
+        memory  (dict[int, Expr]): Final memory, only the cells that were set; cells
+                                   computed from a value read at a symbolic address
+                                   are `UNKNOWN`
+        outputs (list[Expr])     : Output values, in order
+    """
+
+    memory: Dict[int, Expr]
+    outputs: List[Expr]
+
+
+def symbolic_run(
+    codes: Sequence[int],
+    symbols: Iterable[int],
+    inputs: Iterable[int] = (),
+    max_steps: Optional[int] = None,
+) -> SymbolicResult:
+    """
+    Run a program with the initial values of some cells left symbolic
+
+    Args:
+        codes     (Sequence[int]): Program codes
+        symbols   (Iterable[int]): Addresses of the symbolic cells
+        inputs    (Iterable[int]): Input values, in order
+        max_steps (int?)         : Maximum number of instructions to execute
+
+    Returns:
+        (SymbolicResult): Final memory and outputs
+    """
+    memory: Dict[int, Expr] = dict(enumerate(codes))
+    for address in symbols:
+        memory[address] = Poly.symbol(address)
+    inputs_iter = iter(inputs)
+    outputs: List[Expr] = []
+    pointer = 0
+    rel_base = 0
+    steps = 0
+
+    def address_of(address: int, param_type: int) -> int:
+        raw = _concrete(memory.get(address, 0))
+        if param_type == PARAM_TYPES.POSITION:
+            target = raw
+        elif param_type == PARAM_TYPES.RELATIVE:
+            target = rel_base + raw
+        else:
+            raise ValueError(f"{param_type=} unknown or invalid param type")
+        if target < 0:
+            raise IndexError(f"Index cannot be negative; got {target}")
+        return target
+
+    def value_of(address: int, param_type: int) -> Expr:
+        if param_type == PARAM_TYPES.VALUE:
+            return memory.get(address, 0)
+        # Reading from a symbolic address is fine as long as the value is not used
+        if not isinstance(memory.get(address, 0), int):
+            return UNKNOWN
+        return memory.get(address_of(address, param_type), 0)
+
+    while max_steps is None or steps < max_steps:
+        steps += 1
+        op, param1_type, param2_type, param3_type = parse_op_code(
+            _concrete(memory.get(pointer, 0))
+        )
+        if op == OP_CODES.END:
+            return SymbolicResult(memory, outputs)
+        elif op in (OP_CODES.ADD, OP_CODES.MUL):
+            param1 = value_of(pointer + 1, param1_type)
+            param2 = value_of(pointer + 2, param2_type)
+            result = param1 + param2 if op == OP_CODES.ADD else param1 * param2
+            memory[address_of(pointer + 3, param3_type)] = _simplify(result)
+            pointer += 4
+        elif op == OP_CODES.INPUT:
+            inp = next(inputs_iter, None)
+            if inp is None:
+                raise ValueError("Program needs more input than given")
+            memory[address_of(pointer + 1, param1_type)] = inp
+            pointer += 2
+        elif op == OP_CODES.OUTPUT:
+            outputs.append(value_of(pointer + 1, param1_type))
+            pointer += 2
+        elif op in (OP_CODES.JUMP_TRUE, OP_CODES.JUMP_FALSE):
+            param1 = _concrete(value_of(pointer + 1, param1_type))
+            param2 = _concrete(value_of(pointer + 2, param2_type))
+            if bool(param1) == (op == OP_CODES.JUMP_TRUE):
+                pointer = param2
+            else:
+                pointer += 3
+        elif op in (OP_CODES.LESS_THAN, OP_CODES.EQUAL):
+            param1 = _concrete(value_of(pointer + 1, param1_type))
+            param2 = _concrete(value_of(pointer + 2, param2_type))
+            result = param1 < param2 if op == OP_CODES.LESS_THAN else param1 == param2
+            memory[address_of(pointer + 3, param3_type)] = int(result)
+            pointer += 4
+        elif op == OP_CODES.ADJUST_REL_BASE:
+            rel_base += _concrete(value_of(pointer + 1, param1_type))
+            pointer += 2
+        else:
+            raise ValueError(f"{op=} unknown operation")
+    raise NotSymbolic(f"Program did not halt within {max_steps=} instructions")
+
+
+def _solve_affine(
+    poly: Poly, target: int, domains: Mapping[int, Sequence[int]]
+) -> Iterator[Dict[int, int]]:
+    """
+    Find the values of the symbols for which an affine polynomial equals `target`
+    All symbols but one with a non-zero coefficient are enumerated, and the last one
+      is solved for directly
+
+    Args:
+        poly    (Poly)                       : Affine polynomial
+        target  (int)                        : Value to reach
+        domains (Mapping[int, Sequence[int]]): Possible values of each symbol
+
+    Yields:
+        (dict[int, int]): Value of each symbol, in enumeration order
+    """
+    coefs = {monomial[0]: coef for monomial, coef in poly.terms.items() if monomial}
+    rest = target - poly.terms.get((), 0)
+    if not coefs:
+        if rest == 0:
+            for values in product(*domains.values()):
+                yield dict(zip(domains, values))
+        return
+    solved = max(coefs)
+    solved_domain = set(domains[solved])
+    others = [address for address in domains if address != solved]
+    for values in product(*(domains[address] for address in others)):
+        assignment = dict(zip(others, values))
+        remainder = rest - sum(
+            coef * assignment[address]
+            for address, coef in coefs.items()
+            if address != solved
+        )
+        quotient, modulo = divmod(remainder, coefs[solved])
+        if not modulo and quotient in solved_domain:
+            assignment[solved] = quotient
+            yield {address: assignment[address] for address in domains}
+
+
+def solve(
+    codes: Sequence[int],
+    domains: Mapping[int, Iterable[int]],
+    target: Tuple[int, int],
+    *,
+    inputs: Iterable[int] = (),
+    workers: Optional[int] = None,
+) -> Iterator[Dict[int, int]]:
+    """
+    Find initial values of some cells for which a cell ends up at a given value
+    The program is evaluated once symbolically; if the target cell is affine in the
+      symbolic cells, the solutions are computed directly. Otherwise, all
+      combinations are run with `sweep`. Either way, every solution is found
+
+    Args:
+        codes   (Sequence[int])              : Program codes
+        domains (Mapping[int, Iterable[int]]): Possible initial values of each cell
+        target  (int*2)                      : Address of the target cell and the
+                                               value to reach
+        inputs  (Iterable[int])              : Input values, in order
+        workers (int?)                       : Number of processes for `sweep`
+
+    Yields:
+        (dict[int, int]): Initial value of each cell in `domains`; in enumeration
+                          order if the target cell is affine, in completion order
+                          otherwise
+    """
+    domain_seqs = {address: list(domain) for address, domain in domains.items()}
+    inputs = list(inputs)
+    address, value = target
+    poly: Optional[Poly] = None
+    try:
+        cell = symbolic_run(codes, domain_seqs, inputs).memory.get(address, 0)
+        if isinstance(cell, int):
+            poly = Poly({(): cell})
+        elif isinstance(cell, Poly):
+            poly = cell
+    except NotSymbolic:
+        pass
+    if poly is not None and poly.degree <= 1:
+        yield from _solve_affine(poly, value, domain_seqs)
+        return
+    patches = (
+        dict(zip(domain_seqs, values)) for values in product(*domain_seqs.values())
+    )
+    for sweep_result in sweep(
+        codes, patches, inputs=inputs, read=[address], workers=workers
+    ):
+        if sweep_result.cells[0] == value:
+            yield sweep_result.patch
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import zlib
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from .machine import Machine, Snapshot
+from .memory import PAGE_BITS, PAGE_SIZE, Memory
+
+
+class Checkpoint(NamedTuple):
+    """
+    State of a recorded machine after a number of instructions
+    Memory is delta-encoded: only the pages that changed since the previous
+      checkpoint are kept, unless it is a keyframe
+
+    Properties:
+        step        (int)             : Number of instructions executed
+        pointer     (int)             : Instruction pointer
+        rel_base    (int)             : Relative base
+        halted      (bool)            : Whether op 99 has been reached
+        consumed    (int)             : Number of input values consumed
+        dense_pages (int)             : Number of pages in the dense image
+        pages       (dict[int, bytes]): Compressed pages, by page number
+        big         (dict[int, int]?) : Values of the cells that overflow int64;
+                                        `None` if unchanged
+        keyframe    (bool)            : Whether `pages` holds every page
+    """
+
+    step: int
+    pointer: int
+    rel_base: int
+    halted: bool
+    consumed: int
+    dense_pages: int
+    pages: Dict[int, bytes]
+    big: Optional[Dict[int, int]]
+    keyframe: bool
+
+
+class Trace:
+    """
+    Recording of a run: the input values, and checkpoints every `interval`
+      instructions. The state after any step can be rebuilt by replaying at most
+      `interval` instructions from the checkpoint before it
+
+    Args:
+        interval (int): Number of instructions between checkpoints
+        keyframe (int): Number of checkpoints between full copies of the memory
+
+    Public Properties:
+        interval    (int)             : Number of instructions between checkpoints
+        keyframe    (int)             : Number of checkpoints between full copies of
+                                        the memory
+        inputs      (list[int])       : Input values, in order
+        fed_at      (array[int])      : Step at which each input value was given
+        checkpoints (list[Checkpoint]): Checkpoints, in order
+        steps       (int)             : Number of instructions recorded
+    """
+
+    def __init__(self, interval: int, keyframe: int) -> None:
+        self.interval = interval
+        self.keyframe = keyframe
+        self.inputs: List[int] = []
+        self.fed_at: array[int] = array("q")
+        self.checkpoints: List[Checkpoint] = []
+        self.steps = 0
+
+    def replay(self, step: int) -> Machine:
+        """
+        Rebuild the machine as it was after a number of instructions
+        Its pending input values are those given by then and not consumed yet; its
+          output values are only those produced since the checkpoint before `step`
+
+        Args:
+            step (int): Number of instructions executed
+
+        Returns:
+            (Machine): New machine in that state
+        """
+        if not 0 <= step <= self.steps:
+            raise ValueError(f"{step=} is outside of the recorded 0-{self.steps}")
+        index = min(step // self.interval, len(self.checkpoints) - 1)
+        checkpoint = self.checkpoints[index]
+        start = index - index % self.keyframe
+        pages: Dict[int, bytes] = {}
+        big: Dict[int, int] = {}
+        for previous in self.checkpoints[start : index + 1]:
+            pages.update(previous.pages)
+            if previous.big is not None:
+                big = previous.big
+
+        memory = Memory()
+        dense = array("q")
+        for page_number in range(checkpoint.dense_pages):
+            dense.frombytes(zlib.decompress(pages.pop(page_number)))
+        memory.dense = dense
+        for page_number, data in pages.items():
+            memory.pages[page_number] = array("q", zlib.decompress(data))
+        memory.big.update(big)
+        inputs = tuple(
+            value
+            for value, fed_at in zip(
+                self.inputs[checkpoint.consumed :],
+                self.fed_at[checkpoint.consumed :],
+            )
+            if fed_at <= step
+        )
+        machine = Machine.from_snapshot(
+            Snapshot(
+                memory,
+                checkpoint.pointer,
+                checkpoint.rel_base,
+                inputs,
+                (),
+                checkpoint.halted,
+            )
+        )
+        if machine.run_for(step - checkpoint.step) != step - checkpoint.step:
+            raise ValueError(f"Replay to {step=} diverged from the recording")
+        return machine
+
+
+class Recorder:
+    """
+    Run a machine while recording a trace of it
+    Input values have to be given through the recorder, so that they are recorded
+
+    Args:
+        machine  (Machine): Machine to record, in its initial state; it must run on
+                            the dispatch table (see `Machine.sliceable`)
+        interval (int)    : Number of instructions between checkpoints
+        keyframe (int)    : Number of checkpoints between full copies of the memory
+
+    Public Properties:
+        machine (Machine): Recorded machine
+        trace   (Trace)  : Recording so far
+    """
+
+    def __init__(
+        self, machine: Machine, interval: int = 100_000, keyframe: int = 16
+    ) -> None:
+        if not machine.sliceable:
+            raise ValueError("Machines with jit, profile or memo cannot be recorded")
+        self.machine = machine
+        self.trace = Trace(interval, keyframe)
+        # Uncompressed pages as of the last checkpoint, by page number
+        self._pages: Dict[int, bytes] = {}
+        self._big: Dict[int, int] = {}
+        self.trace.inputs.extend(machine.inputs)
+        self.trace.fed_at.extend([0] * len(machine.inputs))
+        self._checkpoint()
+
+    def feed_input(self, *values: int) -> None:
+        """
+        Queue values to be consumed by op 3
+
+        Args:
+            *values (int): Input values, in order
+        """
+        self.machine.feed_input(*values)
+        self.trace.inputs.extend(values)
+        self.trace.fed_at.extend([self.trace.steps] * len(values))
+
+    def run(self) -> bool:
+        """
+        Execute until the program halts or needs input that is not available, taking
+          checkpoints on the way
+
+        Returns:
+            (bool): Whether the program has halted
+        """
+        trace = self.trace
+        while True:
+            budget = trace.interval - trace.steps % trace.interval
+            executed = self.machine.run_for(budget)
+            trace.steps += executed
+            if executed == budget:
+                self._checkpoint()
+            else:
+                return self.machine.halted
+
+    def _checkpoint(self) -> None:
+        """
+        Record the current state, with the pages that changed since the last
+          checkpoint
+        """
+        machine = self.machine
+        memory = machine.memory
+        trace = self.trace
+        keyframe = len(trace.checkpoints) % trace.keyframe == 0
+        current: Dict[int, bytes] = {}
+        cells = memoryview(memory.dense).cast("B")
+        page_bytes = 8 * PAGE_SIZE
+        for page_number in range(len(memory.dense) >> PAGE_BITS):
+            offset = page_number * page_bytes
+            current[page_number] = cells[offset : offset + page_bytes].tobytes()
+        for page_number, page in memory.pages.items():
+            current[page_number] = page.tobytes()
+        pages = {
+            page_number: zlib.compress(data, 1)
+            for page_number, data in current.items()
+            if keyframe or self._pages.get(page_number) != data
+        }
+        big: Optional[Dict[int, int]] = None
+        if keyframe or memory.big != self._big:
+            big = self._big = dict(memory.big)
+        self._pages = current
+        trace.checkpoints.append(
+            Checkpoint(
+                trace.steps,
+                machine.pointer,
+                machine.rel_base,
+                machine.halted,
+                len(trace.inputs) - len(machine.inputs),
+                len(memory.dense) >> PAGE_BITS,
+                pages,
+                big,
+                keyframe,
+            )
+        )
+
+
+def record(
+    codes: Iterable[int],
+    inputs: Iterable[int] = (),
+    interval: int = 100_000,
+    keyframe: int = 16,
+) -> Trace:
+    """
+    Run a program to completion while recording a trace of it
+
+    Args:
+        codes    (Iterable[int]): Program codes
+        inputs   (Iterable[int]): Input values, in order
+        interval (int)          : Number of instructions between checkpoints
+        keyframe (int)          : Number of checkpoints between full copies of the
+                                  memory
+
+    Returns:
+        (Trace): Recording of the run
+    """
+    recorder = Recorder(Machine(codes, inputs), interval, keyframe)
+    recorder.run()
+    return recorder.trace
@@ -0,0 +1,314 @@
+"""
+Check that the machine agrees with the original interpreter: outputs and final
+  memory, on the puzzle inputs of Days 02, 05, 07, 09 and 11 and on programs whose
+  cells overflow int64, in every execution mode
+
+Usage:
+    python -m intcode.verify
+  or as part of the test suite (`tests/test_verify.py`):
+    python -m pytest
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+from array import array
+from functools import partial
+from pathlib import Path
+from typing import (
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .image import Image, write_image
+from .machine import Machine
+from .memo import Memoizer
+from .memory import INT64_MAX
+from .parse import parse_program
+from .paths import REPO_PATH
+from .reference import Code_List, intcode_calculation
+
+# Gives the next input value, from the output values produced since the previous
+#   one; `None` to stop
+Responder = Callable[[List[int]], Optional[int]]
+
+# Makes a new machine running a program
+Factory = Callable[[Sequence[int]], Machine]
+
+# Output values, in order, and the cells of the program at the end of the run
+Transcript = Tuple[List[int], List[int]]
+
+# Programs whose cells overflow int64 and come back into range, or start out of it
+OVERFLOW_PROGRAMS: Dict[str, List[int]] = {
+    # 2^80 is stored, output, and brought back to 1, which is output
+    "overflow product": [
+        1102, 1 << 40, 1 << 40, 17,
+        4, 17,
+        1001, 17, 1 - (1 << 80), 17,
+        4, 17,
+        99, 0, 0, 0, 0, 0,
+    ],
+    # INT64_MAX + 1 overflows, and INT64_MIN is the marker of overflowed cells
+    "int64 bounds": [
+        1101, INT64_MAX, 1, 19,
+        1101, -INT64_MAX, -1, 20,
+        4, 19,
+        4, 20,
+        1, 19, 20, 21,
+        4, 21,
+        99, 0, 0, 0,
+    ],
+    # Cells out of int64 from the start, read relative to the relative base
+    "big image": [
+        109, 11,
+        204, 0,
+        22201, 0, 1, 2,
+        204, 2,
+        99,
+        -(1 << 70), 1 << 70, 5,
+    ],
+}
+
+
+def _respond_with(values: Sequence[int]) -> Responder:
+    """
+    Make a responder giving fixed input values
+
+    Args:
+        values (Sequence[int]): Input values, in order
+
+    Returns:
+        (Responder): Responder stopping once the values run out
+    """
+    values_iter = iter(values)
+    return lambda _: next(values_iter, None)
+
+
+def _feedback(phase: int, signal: int = 0) -> Responder:
+    """
+    Make a responder looping an amplifier onto itself: its phase setting, the input
+      signal, then each output signal
+
+    Args:
+        phase  (int): Phase setting
+        signal (int): First input signal
+
+    Returns:
+        (Responder): Responder
+    """
+    values: Iterator[int] = iter((phase, signal))
+
+    def respond(outputs: List[int]) -> Optional[int]:
+        return next(values, outputs[-1] if outputs else None)
+
+    return respond
+
+
+def _robot(start: int) -> Responder:
+    """
+    Make a responder driving a hull painting robot
+
+    Args:
+        start (int): Color of the starting panel
+
+    Returns:
+        (Responder): Responder giving the color of the panel under the robot
+    """
+    board: Dict[complex, int] = {0j: start}
+    position = 0j
+    direction = 1 + 0j
+
+    def respond(outputs: List[int]) -> Optional[int]:
+        nonlocal position, direction
+        if outputs:
+            color, turn = outputs
+            board[position] = color
+            direction *= 1j if turn == 0 else -1j
+            position += direction
+        return board.get(position, 0)
+
+    return respond
+
+
+def run_reference_session(codes: Sequence[int], respond: Responder) -> Transcript:
+    """
+    Run a program on the reference interpreter, driven by a responder
+
+    Args:
+        codes   (Sequence[int]): Program codes
+        respond (Responder)    : Gives the input values
+
+    Returns:
+        (Transcript): Output values and final cells of the program
+    """
+    memory = Code_List(codes)
+    compy = intcode_calculation(memory)
+    transcript: List[int] = []
+    pending: List[int] = []
+    try:
+        value = next(compy)
+        while True:
+            if value is None:
+                inp = respond(pending)
+                pending = []
+                if inp is None:
+                    break
+                value = compy.send(inp)
+            else:
+                transcript.append(value)
+                pending.append(value)
+                value = next(compy)
+    except StopIteration:
+        pass
+    return transcript, [memory[index] for index in range(len(codes))]
+
+
+def run_session(machine: Machine, respond: Responder, length: int) -> Transcript:
+    """
+    Run a machine, driven by a responder
+
+    Args:
+        machine (Machine)  : Machine to run, in its initial state
+        respond (Responder): Gives the input values
+        length  (int)      : Number of cells of the program
+
+    Returns:
+        (Transcript): Output values and final cells of the program
+    """
+    transcript: List[int] = []
+    while True:
+        pending = machine.run(until="input_needed")
+        transcript += pending
+        if machine.halted:
+            break
+        inp = respond(pending)
+        if inp is None:
+            break
+        machine.feed_input(inp)
+    return transcript, [machine.memory[index] for index in range(length)]
+
+
+def _cases() -> Iterator[Tuple[str, Sequence[int], Callable[[], Responder]]]:
+    """
+    List the programs to check
+
+    Yields:
+        (str)            : Name of the case
+        (Sequence[int])  : Program codes
+        (() -> Responder): Makes the responder driving the program
+    """
+
+    def day(path: str) -> Union[array[int], List[int]]:
+        return parse_program(REPO_PATH / path / "input.txt")
+
+    day_02 = day("Day 02/01 - Intcode Computer Construction")
+    for noun, verb in ((12, 2), (53, 79), (0, 0), (99, 99)):
+        codes = [day_02[0], noun, verb, *day_02[3:]]
+        yield f"Day 02 noun={noun} verb={verb}", codes, lambda: _respond_with(())
+    day_05 = day("Day 05/01 - Sunny with a Chance of Asteroids")
+    for system in (1, 5):
+        yield f"Day 05 system={system}", day_05, partial(_respond_with, [system])
+    day_07 = day("Day 07/01 - Amplification Circuit")
+    for phase in range(10):
+        yield f"Day 07 phase={phase}", day_07, partial(_feedback, phase)
+    day_09 = day("Day 09/01 - Sensor Boost")
+    for mode in (1, 2):
+        yield f"Day 09 mode={mode}", day_09, partial(_respond_with, [mode])
+    day_11 = day("Day 11/01 - Space Police")
+    for start in (0, 1):
+        yield f"Day 11 start={start}", day_11, partial(_robot, start)
+    for name, codes in OVERFLOW_PROGRAMS.items():
+        yield name, codes, lambda: _respond_with(())
+
+
+def _modes(image_dir: Path) -> Dict[str, Factory]:
+    """
+    List the execution modes to check
+
+    Args:
+        image_dir (Path): Directory to write binary images to
+
+    Returns:
+        (dict[str, Factory]): Machine factory, by mode name
+    """
+
+    def from_image(codes: Sequence[int]) -> Machine:
+        path = image_dir / "program.icim"
+        write_image(codes, path)
+        return Machine(Image(path))
+
+    return {
+        "dispatch": Machine,
+        "jit": lambda codes: Machine(codes, jit=True),
+        "memo": lambda codes: Machine(codes, memo=Memoizer()),
+        "image": from_image,
+    }
+
+
+class CheckResult(NamedTuple):
+    """
+    Result of one case in one execution mode
+
+    Properties:
+        case    (str) : Name of the case
+        mode    (str) : Name of the execution mode
+        outputs (int) : Number of output values
+        problem (str?): How the run differs from the reference; `None` if it agrees
+    """
+
+    case: str
+    mode: str
+    outputs: int
+    problem: Optional[str]
+
+    def __str__(self) -> str:
+        status = self.problem or f"ok ({self.outputs} outputs)"
+        return f"{self.case} [{self.mode}]: {status}"
+
+
+def verify() -> List[CheckResult]:
+    """
+    Run every case in every mode and compare with the reference interpreter
+
+    Returns:
+        (list[CheckResult]): Results, by case then mode
+    """
+    results: List[CheckResult] = []
+    with tempfile.TemporaryDirectory() as image_dir:
+        modes = _modes(Path(image_dir))
+        for name, codes, responder in _cases():
+            expected = run_reference_session(codes, responder())
+            for mode, factory in modes.items():
+                outputs, cells = run_session(
+                    factory(codes), responder(), len(codes)
+                )
+                problem: Optional[str] = None
+                if outputs != expected[0]:
+                    problem = "outputs differ"
+                elif cells != expected[1]:
+                    problem = "final memory differs"
+                results.append(CheckResult(name, mode, len(outputs), problem))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.parse_args()
+
+    results = verify()
+    for result in results:
+        print(result)
+    if any(result.problem is not None for result in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+"""
+Shared password counting used by the Secure Container puzzles (Day 04)
+"""
+
+from .digits import count_passwords, count_up_to
+
+__all__ = [
+    "count_passwords",
+    "count_up_to",
+]
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Tuple
+
+# Digit-DP state: (last digit, length of its run capped at 3, whether a closed run
+#   qualified); no digit yet is (0, 0, False)
+State = Tuple[int, int, bool]
+
+
+def _closes(run: int, exact_pair: bool) -> bool:
+    """
+    Whether a run of equal digits qualifies the number once it ends
+
+    Args:
+        run        (int) : Length of the run, capped at 3
+        exact_pair (bool): Whether the run must be of exactly 2 digits, rather than
+                           at least 2
+
+    Returns:
+        (bool): Whether the run qualifies
+    """
+    return run == 2 if exact_pair else run >= 2
+
+
+def _step(state: State, digit: int, exact_pair: bool) -> State:
+    """
+    Append a digit, no smaller than the last one
+
+    Args:
+        state      (State): State before the digit
+        digit      (int)  : Digit
+        exact_pair (bool) : Whether a run must be of exactly 2 digits
+
+    Returns:
+        (State): State after the digit
+    """
+    last, run, found = state
+    if digit == last:
+        return last, min(run + 1, 3), found
+    return digit, 1, found or _closes(run, exact_pair)
+
+
+@lru_cache(maxsize=None)
+def _count_free(length: int, state: State, exact_pair: bool) -> int:
+    """
+    Count the ways to append digits to a number so that it qualifies, with no bound
+
+    Args:
+        length     (int)  : Number of digits to append
+        state      (State): State before them
+        exact_pair (bool) : Whether a run must be of exactly 2 digits
+
+    Returns:
+        (int): Number of ways
+    """
+    last, run, found = state
+    if not length:
+        return int(found or _closes(run, exact_pair))
+    # Digits never decrease, so the first is at least 1 and there is no 0 after it
+    return sum(
+        _count_free(length - 1, _step(state, digit, exact_pair), exact_pair)
+        for digit in range(max(last, 1), 10)
+    )
+
+
+def count_up_to(upper: int, exact_pair: bool = False) -> int:
+    """
+    Count the qualifying numbers from 1 to a bound: their digits never decrease, and
+      a run of equal digits is at least, or exactly, 2 long
+    Runs in time polynomial in the number of digits of the bound
+
+    Args:
+        upper      (int) : Largest number, included
+        exact_pair (bool): Whether a run must be of exactly 2 digits
+
+    Returns:
+        (int): Number of qualifying numbers
+    """
+    if upper < 1:
+        return 0
+    digits = [int(char) for char in str(upper)]
+    start: State = (0, 0, False)
+    # Shorter numbers
+    count = sum(_count_free(length, start, exact_pair) for length in range(len(digits)))
+    # Numbers as long, following the bound until they go below it
+    state = start
+    for position, bound in enumerate(digits):
+        rest = len(digits) - position - 1
+        for digit in range(max(state[0], 1), bound):
+            count += _count_free(rest, _step(state, digit, exact_pair), exact_pair)
+        # The bound decreases from here; no number following it further qualifies
+        if bound < max(state[0], 1):
+            return count
+        state = _step(state, bound, exact_pair)
+    # The bound itself
+    return count + int(state[2] or _closes(state[1], exact_pair))
+
+
+def count_passwords(lower: int, upper: int, exact_pair: bool = False) -> int:
+    """
+    Count the possible passwords in a range: numbers whose digits never decrease,
+      with a run of equal digits at least, or exactly, 2 long
+
+    Args:
+        lower      (int) : Smallest number, included
+        upper      (int) : Largest number, included
+        exact_pair (bool): Whether a run must be of exactly 2 digits (Part 2), rather
+                           than at least 2 (Part 1)
+
+    Returns:
+        (int): Number of possible passwords
+    """
+    if lower > upper:
+        return 0
+    return count_up_to(upper, exact_pair) - count_up_to(lower - 1, exact_pair)
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from intcode.verify import verify
+
+
+def test_verify() -> None:
+    """
+    Every case agrees with the reference interpreter in every execution mode
+    """
+    problems = [str(result) for result in verify() if result.problem is not None]
+    assert not problems, "\n".join(problems)
@@ -0,0 +1,25 @@
+"""
+Shared wire geometry used by the Crossing Wires puzzles (Day 03)
+"""
+
+from .index import IntervalTree, SegmentTree, WireIndex
+from .parse import read_wires, tokenize
+from .raster import first_visits, grid_crossings, heatmap, rasterize
+from .segments import Crossing, Segment, crossings, iter_segments, trace
+
+__all__ = [
+    "IntervalTree",
+    "SegmentTree",
+    "WireIndex",
+    "Crossing",
+    "Segment",
+    "read_wires",
+    "tokenize",
+    "first_visits",
+    "grid_crossings",
+    "heatmap",
+    "rasterize",
+    "crossings",
+    "iter_segments",
+    "trace",
+]
@@ -0,0 +1,480 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from itertools import count
+from typing import (
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from .segments import Crossing, Segment, _candidates
+
+T = TypeVar("T")
+
+
+class _Node(Generic[T]):
+    """
+    Node of an interval tree, holding the intervals that contain its center
+
+    Properties:
+        low, high (int*2)                         : Range of the node, ends included
+        center    (int)                           : Middle of the range
+        by_low    (list[tuple[int, int, int, T]]) : (low, high, order, value) of the
+                                                    intervals, by low end
+        by_high   (list[tuple[int, int, int, T]]) : (high, low, order, value) of the
+                                                    intervals, by high end
+        left      (_Node?)                        : Node of the range below the center
+        right     (_Node?)                        : Node of the range above the center
+    """
+
+    __slots__ = ("low", "high", "center", "by_low", "by_high", "left", "right")
+
+    def __init__(self, low: int, high: int) -> None:
+        self.low = low
+        self.high = high
+        self.center = (low + high) // 2
+        self.by_low: List[Tuple[int, int, int, T]] = []
+        self.by_high: List[Tuple[int, int, int, T]] = []
+        self.left: Optional[_Node[T]] = None
+        self.right: Optional[_Node[T]] = None
+
+
+class IntervalTree(Generic[T]):
+    """
+    Centered interval tree over integer intervals, each with a value
+    The centers are those of a binary split of the range of the root, which grows by
+      putting a new root above it when an interval does not fit; the tree stays
+      about as deep as the log of the coordinates however the intervals are added,
+      and never needs rebuilding
+
+    Public Properties:
+        size (int): Number of intervals
+    """
+
+    def __init__(self) -> None:
+        self.size = 0
+        self._root: _Node[T] = _Node(-1, 1)
+        # Tie breaker, so that values are never compared
+        self._order = count()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, low: int, high: int, value: T) -> None:
+        """
+        Add an interval
+
+        Args:
+            low, high (int*2): Ends of the interval, included
+            value     (T)    : Value of the interval
+        """
+        if low > high:
+            low, high = high, low
+        self._grow(low, high)
+        node = self._root
+        while not low <= node.center <= high:
+            if high < node.center:
+                if node.left is None:
+                    node.left = _Node(node.low, node.center - 1)
+                node = node.left
+            else:
+                if node.right is None:
+                    node.right = _Node(node.center + 1, node.high)
+                node = node.right
+        order = next(self._order)
+        insort(node.by_low, (low, high, order, value))
+        insort(node.by_high, (high, low, order, value))
+        self.size += 1
+
+    def _grow(self, low: int, high: int) -> None:
+        """
+        Put new roots above the root until its range holds an interval, each with
+          the old root as one of its children
+
+        Args:
+            low, high (int*2): Ends of the interval, included
+        """
+        root = self._root
+        while high > root.high:
+            # Center right after the old range, which is then the left one
+            parent: _Node[T] = _Node(root.low, 2 * root.high + 2 - root.low)
+            parent.left = root
+            root = parent
+        while low < root.low:
+            parent = _Node(2 * root.low - 2 - root.high, root.high)
+            parent.right = root
+            root = parent
+        self._root = root
+
+    def overlapping(self, low: int, high: int) -> Iterator[Tuple[int, int, T]]:
+        """
+        Find the intervals sharing at least a point with an interval
+
+        Args:
+            low, high (int*2): Ends of the interval, included
+
+        Yields:
+            (int, int) : Ends of an interval found
+            (T)        : Its value
+        """
+        stack: List[_Node[T]] = [self._root]
+        while stack:
+            node = stack.pop()
+            if high < node.center:
+                # All intervals reach the center, so past the query on the right
+                for other_low, other_high, _, value in node.by_low:
+                    if other_low > high:
+                        break
+                    yield other_low, other_high, value
+                children = (node.left,)
+            elif low > node.center:
+                for other_high, other_low, _, value in reversed(node.by_high):
+                    if other_high < low:
+                        break
+                    yield other_low, other_high, value
+                children = (node.right,)
+            else:
+                for other_low, other_high, _, value in node.by_low:
+                    yield other_low, other_high, value
+                children = (node.left, node.right)
+            stack.extend(child for child in children if child is not None)
+
+    def stabbing(self, point: int) -> Iterator[Tuple[int, int, T]]:
+        """
+        Find the intervals containing a point
+
+        Args:
+            point (int): Point
+
+        Yields:
+            (int, int) : Ends of an interval found
+            (T)        : Its value
+        """
+        return self.overlapping(point, point)
+
+
+class _SegmentNode(Generic[T]):
+    """
+    Node of a segment tree, holding the intervals that cover its whole range
+
+    Properties:
+        low, high (int*2)                              : Range of the node, ends
+                                                         included
+        center    (int)                                : Last point of the left half
+        entries   (list[tuple[int, int, int, int, T]]) : (key, order, low, high,
+                                                         value) of the intervals, by
+                                                         key
+        left      (_SegmentNode?)                      : Node of the left half
+        right     (_SegmentNode?)                      : Node of the right half
+    """
+
+    __slots__ = ("low", "high", "center", "entries", "left", "right")
+
+    def __init__(self, low: int, high: int) -> None:
+        self.low = low
+        self.high = high
+        self.center = (low + high) // 2
+        self.entries: List[Tuple[int, int, int, int, T]] = []
+        self.left: Optional[_SegmentNode[T]] = None
+        self.right: Optional[_SegmentNode[T]] = None
+
+
+class SegmentTree(Generic[T]):
+    """
+    Segment tree over integer intervals, each with an integer key and a value,
+      finding the intervals containing a point whose key is within a range
+    Each interval is held by the few nodes of a binary split of the coordinates
+      whose ranges it covers, sorted by key; the nodes containing a point are those
+      on one path from the root, so a query bisects into the range of keys at each
+      of them and only goes through the intervals it finds. The root grows like that
+      of `IntervalTree`
+
+    Public Properties:
+        size (int): Number of intervals
+    """
+
+    def __init__(self) -> None:
+        self.size = 0
+        self._root: _SegmentNode[T] = _SegmentNode(-1, 0)
+        # Tie breaker, so that values are never compared
+        self._order = count()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, low: int, high: int, key: int, value: T) -> None:
+        """
+        Add an interval
+
+        Args:
+            low, high (int*2): Ends of the interval, included
+            key       (int)  : Key of the interval
+            value     (T)    : Value of the interval
+        """
+        if low > high:
+            low, high = high, low
+        self._grow(low, high)
+        entry = (key, next(self._order), low, high, value)
+        stack: List[_SegmentNode[T]] = [self._root]
+        while stack:
+            node = stack.pop()
+            if low <= node.low and node.high <= high:
+                insort(node.entries, entry)
+                continue
+            if low <= node.center:
+                if node.left is None:
+                    node.left = _SegmentNode(node.low, node.center)
+                stack.append(node.left)
+            if high > node.center:
+                if node.right is None:
+                    node.right = _SegmentNode(node.center + 1, node.high)
+                stack.append(node.right)
+        self.size += 1
+
+    def _grow(self, low: int, high: int) -> None:
+        """
+        Put new roots above the root until its range holds an interval, each with
+          the old root as one of its halves
+
+        Args:
+            low, high (int*2): Ends of the interval, included
+        """
+        root = self._root
+        while high > root.high:
+            parent: _SegmentNode[T] = _SegmentNode(
+                root.low, 2 * root.high + 1 - root.low
+            )
+            parent.left = root
+            root = parent
+        while low < root.low:
+            parent = _SegmentNode(2 * root.low - 1 - root.high, root.high)
+            parent.right = root
+            root = parent
+        self._root = root
+
+    def stabbing(self, point: int, low: int, high: int) -> Iterator[Tuple[int, T]]:
+        """
+        Find the intervals containing a point, with a key within a range
+
+        Args:
+            point     (int)  : Point
+            low, high (int*2): Ends of the range of keys, included
+
+        Yields:
+            (int): Key of an interval found
+            (T)  : Its value
+        """
+        node: Optional[_SegmentNode[T]] = self._root
+        if not self._root.low <= point <= self._root.high:
+            return
+        while node is not None:
+            entries = node.entries
+            for position in range(bisect_left(entries, (low,)), len(entries)):
+                key, _, _, _, value = entries[position]
+                if key > high:
+                    break
+                yield key, value
+            node = node.left if point <= node.center else node.right
+
+
+# Segment of a wire held by an index: (coordinate across the segment, segment, wire)
+_Entry = Tuple[int, Segment, int]
+
+# Pair of wires, the one added first first
+Pair = Tuple[int, int]
+
+
+class WireIndex:
+    """
+    Index of the segments of many wires starting at the origin, finding the
+      crossings of every pair of wires as wires are added
+    Horizontal and vertical segments are held in segment trees along x and y, keyed
+      by their y and x, and in interval trees per line for the collinear overlaps; a
+      new wire only queries them with its own segments. A wire crossing itself is
+      not counted
+
+    Public Properties:
+        wires (list[list[Segment]]): Segments of each wire, by number; empty for the
+                                     wires not kept
+    """
+
+    def __init__(self) -> None:
+        self.wires: List[List[Segment]] = []
+        self._horizontals: SegmentTree[_Entry] = SegmentTree()
+        self._verticals: SegmentTree[_Entry] = SegmentTree()
+        # Segments along each horizontal (y) and vertical (x) line
+        self._rows: Dict[int, IntervalTree[_Entry]] = {}
+        self._columns: Dict[int, IntervalTree[_Entry]] = {}
+        self._crossings: Dict[Pair, List[Crossing]] = {}
+        self._nearest: Optional[Tuple[Pair, Crossing]] = None
+
+    def __len__(self) -> int:
+        return len(self.wires)
+
+    def add(self, segments: Iterable[Segment], keep: bool = True) -> int:
+        """
+        Add a wire, finding where it crosses the wires already added
+        Segments are matched as they come, so a lazy iterable (see `iter_segments`)
+          is never held whole; unless kept, only the crossings of the wire are
+
+        Args:
+            segments (Iterable[Segment]): Segments of the wire, in order
+            keep     (bool)             : Whether to index the wire, so that the wires
+                                          added later are matched against it
+
+        Returns:
+            (int): Number of the wire
+        """
+        wire = len(self.wires)
+        kept: List[Segment] = []
+        self.wires.append(kept)
+        for segment in segments:
+            if segment.horizontal:
+                self._cross(wire, segment)
+            else:
+                self._cross(wire, segment.transposed(), transposed=True)
+            if keep:
+                self._insert(wire, segment)
+                kept.append(segment)
+        return wire
+
+    def _insert(self, wire: int, segment: Segment) -> None:
+        """
+        Index a segment of a wire
+
+        Args:
+            wire    (int)    : Number of the wire
+            segment (Segment): Segment
+        """
+        if segment.horizontal:
+            low, high = sorted((segment.x0, segment.x1))
+            entry = (segment.y0, segment, wire)
+            self._horizontals.add(low, high, segment.y0, entry)
+            self._rows.setdefault(segment.y0, IntervalTree()).add(low, high, entry)
+        else:
+            low, high = sorted((segment.y0, segment.y1))
+            entry = (segment.x0, segment, wire)
+            self._verticals.add(low, high, segment.x0, entry)
+            self._columns.setdefault(segment.x0, IntervalTree()).add(low, high, entry)
+
+    def _cross(self, wire: int, segment: Segment, transposed: bool = False) -> None:
+        """
+        Record the crossings of a horizontal segment of a new wire with the segments
+          of the other wires
+        Vertical segments are handled as horizontal ones across the x = y diagonal,
+          with the perpendicular and collinear trees swapped
+
+        Args:
+            wire       (int)    : Number of the new wire
+            segment    (Segment): Horizontal segment
+            transposed (bool)   : Whether the segment is a transposed vertical one
+        """
+        perpendicular = self._horizontals if transposed else self._verticals
+        lines = self._columns if transposed else self._rows
+        line = segment.y0
+        low, high = sorted((segment.x0, segment.x1))
+
+        for along, (_, other, other_wire) in perpendicular.stabbing(line, low, high):
+            self._record(wire, segment, other_wire, other, along, line, transposed)
+        if line in lines:
+            for other_low, other_high, (_, other, other_wire) in lines[
+                line
+            ].overlapping(low, high):
+                for along in _candidates(max(low, other_low), min(high, other_high)):
+                    self._record(
+                        wire, segment, other_wire, other, along, line, transposed
+                    )
+
+    def _record(
+        self,
+        wire: int,
+        segment: Segment,
+        other_wire: int,
+        other: Segment,
+        along: int,
+        line: int,
+        transposed: bool,
+    ) -> None:
+        """
+        Record a crossing of a segment of a new wire with a segment of another wire
+
+        Args:
+            wire       (int)    : Number of the new wire
+            segment    (Segment): Its segment, transposed if `transposed`
+            other_wire (int)    : Number of the other wire
+            other      (Segment): Its segment, never transposed
+            along      (int)    : Position of the crossing along the segment
+            line       (int)    : Position of the segment across it
+            transposed (bool)   : Whether the segment is a transposed vertical one
+        """
+        if other_wire == wire:
+            return
+        x, y = (line, along) if transposed else (along, line)
+        steps = (other.steps_to(x, y), segment.steps_to(along, line))
+        # The wires both start at the origin, which is not a crossing
+        if not all(steps):
+            return
+        crossing = Crossing(x, y, *steps)
+        pair = (other_wire, wire)
+        self._crossings.setdefault(pair, []).append(crossing)
+        if self._nearest is None or crossing.distance < self._nearest[1].distance:
+            self._nearest = (pair, crossing)
+
+    def crossings(self, wire1: int, wire2: int) -> List[Crossing]:
+        """
+        Get where 2 wires cross, as `crossings` in `segments` does
+
+        Args:
+            wire1 (int): Number of the 1st wire
+            wire2 (int): Number of the 2nd wire
+
+        Returns:
+            (list[Crossing]): Crossings, with the steps of the wires in this order
+        """
+        if wire1 <= wire2:
+            return list(self._crossings.get((wire1, wire2), []))
+        return [
+            Crossing(crossing.x, crossing.y, crossing.steps2, crossing.steps1)
+            for crossing in self._crossings.get((wire2, wire1), [])
+        ]
+
+    def all_crossings(self) -> Iterator[Tuple[Pair, Crossing]]:
+        """
+        Get where any 2 wires cross
+
+        Yields:
+            (tuple[int, int]) : Numbers of the wires, the one added first first
+            (Crossing)        : Crossing, with the steps of the wires in this order
+        """
+        for pair, found in self._crossings.items():
+            for crossing in found:
+                yield pair, crossing
+
+    def nearest(self) -> Optional[Tuple[Pair, Crossing]]:
+        """
+        Get the crossing closest to the origin, of any 2 wires
+
+        Returns:
+            (tuple[tuple[int, int], Crossing]?): Numbers of the wires, and crossing;
+                                                 `None` if no wires cross
+        """
+        return self._nearest
+
+    def min_delays(self) -> Dict[Pair, Crossing]:
+        """
+        Get the crossing with the smallest combined steps of each pair of wires that
+          cross
+
+        Returns:
+            (dict[tuple[int, int], Crossing]): Crossing, by numbers of the wires
+        """
+        return {
+            pair: min(found, key=lambda crossing: crossing.delay)
+            for pair, found in self._crossings.items()
+        }
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from itertools import chain, groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import IO, Iterator, Tuple, Union
+
+# Wire text: path of a file, or a stream to read it from
+Source = Union[Path, str, IO[bytes], IO[str]]
+
+# Direction-stepcount pair
+Move = Tuple[str, int]
+
+# Number of characters read at once
+CHUNK_SIZE = 1 << 16
+
+
+def _reads(source: Source, chunk_size: int) -> Iterator[str]:
+    """
+    Read wire text in fixed-size chunks
+
+    Args:
+        source     (Source): Wire text
+        chunk_size (int)   : Number of characters read at once
+
+    Yields:
+        (str): Raw reads
+    """
+    if isinstance(source, (Path, str)):
+        with open(source, "r") as input_fp:
+            yield from iter(lambda: input_fp.read(chunk_size), "")
+        return
+    stream = source
+    for data in iter(lambda: stream.read(chunk_size), stream.read(0)):
+        yield data.decode("ascii") if isinstance(data, bytes) else data
+
+
+def tokenize(
+    source: Source, chunk_size: int = CHUNK_SIZE
+) -> Iterator[Tuple[int, Move]]:
+    """
+    Read the moves of wires, one wire per line, without holding more than a chunk of
+      text and the move being read at once
+
+    Args:
+        source     (Source): Path of the wires, or a stream to read them from
+        chunk_size (int)   : Number of characters read at once
+
+    Yields:
+        (int)             : Number of the wire; empty lines are skipped
+        (tuple[str, int]) : Direction-stepcount pair
+    """
+    wire = 0
+    # Whether the current line has moves
+    seen = False
+    rest = ""
+    # A line break after the last read flushes the last move
+    for data in chain(_reads(source, chunk_size), ("\n",)):
+        data = rest + data
+        # Cut after the last separator, carrying the rest over to the next read
+        cut = max(data.rfind(","), data.rfind("\n")) + 1
+        rest = data[cut:]
+        for line_number, line in enumerate(data[:cut].split("\n")):
+            if line_number and seen:
+                wire += 1
+                seen = False
+            for token in line.split(","):
+                token = token.strip()
+                if not token:
+                    continue
+                try:
+                    move = (token[0], int(token[1:]))
+                except ValueError:
+                    raise ValueError(f"{token=} not a move") from None
+                seen = True
+                yield wire, move
+
+
+def read_wires(
+    source: Source, chunk_size: int = CHUNK_SIZE
+) -> Iterator[Iterator[Move]]:
+    """
+    Read the moves of wires, one wire per line, lazily
+    Each wire must be consumed before the next one is taken, as with `groupby`
+
+    Args:
+        source     (Source): Path of the wires, or a stream to read them from
+        chunk_size (int)   : Number of characters read at once
+
+    Yields:
+        (Iterator[tuple[str, int]]): Direction-stepcount pairs of each wire
+    """
+    for _, tokens in groupby(tokenize(source, chunk_size), key=itemgetter(0)):
+        yield map(itemgetter(1), tokens)
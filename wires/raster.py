@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, List, Sequence, Tuple
+
+from .segments import Crossing, Segment
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional; only the rasterizer needs it
+    numpy = None
+
+if TYPE_CHECKING:
+    from numpy import ndarray
+
+# Coordinates are encoded as (x << 32) + (y + OFFSET) in int64 keys
+OFFSET = 1 << 31
+
+
+def _require_numpy() -> None:
+    if numpy is None:
+        raise ImportError("Rasterizing wires needs NumPy")
+
+
+def rasterize(segments: Sequence[Segment]) -> Tuple[ndarray, ndarray, ndarray]:
+    """
+    Expand segments into the cells they pass through, start points excluded
+
+    Args:
+        segments (Sequence[Segment]): Segments of a wire
+
+    Returns:
+        (ndarray, ndarray) : x and y of each cell, in the order of the wire
+        (ndarray)          : Steps taken along the wire to reach each cell
+    """
+    _require_numpy()
+    ends = numpy.array(segments, dtype=numpy.int64).reshape(-1, 5)
+    x0, y0, x1, y1, steps = ends.T
+    lengths = numpy.abs(x1 - x0) + numpy.abs(y1 - y0)
+    # 1-based position of each cell along its segment
+    firsts = numpy.cumsum(lengths) - lengths
+    offsets = numpy.arange(1, lengths.sum() + 1) - numpy.repeat(firsts, lengths)
+    dxs = numpy.repeat(numpy.sign(x1 - x0), lengths)
+    dys = numpy.repeat(numpy.sign(y1 - y0), lengths)
+    xs = numpy.repeat(x0, lengths) + dxs * offsets
+    ys = numpy.repeat(y0, lengths) + dys * offsets
+    return xs, ys, numpy.repeat(steps, lengths) + offsets
+
+
+def encode(xs: ndarray, ys: ndarray) -> ndarray:
+    """
+    Encode cells as int64 keys
+
+    Args:
+        xs, ys (ndarray*2): x and y of the cells
+
+    Returns:
+        (ndarray): Keys
+    """
+    _require_numpy()
+    for values in (xs, ys):
+        if len(values) and (values.min() < -OFFSET or values.max() >= OFFSET):
+            raise ValueError("Coordinates do not fit in 32 bits")
+    return (xs << 32) + (ys + OFFSET)
+
+
+def decode(keys: ndarray) -> Tuple[ndarray, ndarray]:
+    """
+    Decode int64 keys into cells
+
+    Args:
+        keys (ndarray): Keys
+
+    Returns:
+        (ndarray, ndarray): x and y of the cells
+    """
+    return keys >> 32, (keys & 0xFFFFFFFF) - OFFSET
+
+
+def first_visits(segments: Sequence[Segment]) -> Tuple[ndarray, ndarray]:
+    """
+    Get the cells a wire passes through, with the steps of its first visit of each
+
+    Args:
+        segments (Sequence[Segment]): Segments of a wire, in order
+
+    Returns:
+        (ndarray) : Keys of the cells (see `encode`), sorted
+        (ndarray) : Steps taken along the wire to first reach each cell
+    """
+    xs, ys, steps = rasterize(segments)
+    # Cells come in the order of the wire, so the first of each is its first visit
+    keys, firsts = numpy.unique(encode(xs, ys), return_index=True)
+    return keys, steps[firsts]
+
+
+def grid_crossings(
+    wire1: Sequence[Segment], wire2: Sequence[Segment]
+) -> List[Crossing]:
+    """
+    Find where 2 wires starting at the origin cross, other than there, cell by cell
+    Unlike `crossings`, each point is reported once, with the steps of the first
+      visits
+
+    Args:
+        wire1 (Sequence[Segment]): Segments of the 1st wire
+        wire2 (Sequence[Segment]): Segments of the 2nd wire
+
+    Returns:
+        (list[Crossing]): Crossings, by encoded cell
+    """
+    keys1, steps1 = first_visits(wire1)
+    keys2, steps2 = first_visits(wire2)
+    keys, indices1, indices2 = numpy.intersect1d(
+        keys1, keys2, assume_unique=True, return_indices=True
+    )
+    xs, ys = decode(keys)
+    return [
+        Crossing(*map(int, values))
+        for values in zip(xs, ys, steps1[indices1], steps2[indices2])
+    ]
+
+
+def heatmap(wires: Iterable[Sequence[Segment]]) -> Tuple[ndarray, Tuple[int, int]]:
+    """
+    Count the wires passing through each cell; the origin only counts for the wires
+      coming back to it
+
+    Args:
+        wires (Iterable[Sequence[Segment]]): Segments of each wire
+
+    Returns:
+        (ndarray)         : Counts, indexed by [y, x] from the corner
+        (tuple[int, int]) : x and y of the corner, the smallest of each
+    """
+    _require_numpy()
+    cells = numpy.concatenate(
+        [first_visits(segments)[0] for segments in wires] or [numpy.zeros(0, "int64")]
+    )
+    keys, counts = numpy.unique(cells, return_counts=True)
+    xs, ys = decode(keys)
+    if not len(keys):
+        return numpy.zeros((0, 0), dtype=numpy.int64), (0, 0)
+    corner = (int(xs.min()), int(ys.min()))
+    shape = (int(ys.max()) - corner[1] + 1, int(xs.max()) - corner[0] + 1)
+    grid = numpy.zeros(shape, dtype=numpy.int64)
+    grid[ys - corner[1], xs - corner[0]] = counts
+    return grid, corner
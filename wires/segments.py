@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import (
+    DefaultDict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+# Unit step of each direction
+DIRECTIONS = {"R": (1, 0), "U": (0, 1), "L": (-1, 0), "D": (0, -1)}
+
+
+class Segment(NamedTuple):
+    """
+    A straight horizontal or vertical piece of a wire, ends included
+
+    Properties:
+        x0, y0 (int*2): Start point
+        x1, y1 (int*2): End point
+        steps  (int)  : Steps taken along the wire before the start point
+    """
+
+    x0: int
+    y0: int
+    x1: int
+    y1: int
+    steps: int
+
+    @property
+    def horizontal(self) -> bool:
+        return self.y0 == self.y1
+
+    @property
+    def length(self) -> int:
+        return abs(self.x1 - self.x0) + abs(self.y1 - self.y0)
+
+    def steps_to(self, x: int, y: int) -> int:
+        """
+        Get the steps taken along the wire to reach a point of the segment
+
+        Args:
+            x, y (int*2): Point on the segment
+
+        Returns:
+            (int): Steps from the start of the wire
+        """
+        return self.steps + abs(x - self.x0) + abs(y - self.y0)
+
+    def transposed(self) -> Segment:
+        """
+        Mirror the segment across the x = y diagonal, so that vertical segments can
+          be handled as horizontal ones
+        """
+        return Segment(self.y0, self.x0, self.y1, self.x1, self.steps)
+
+
+class Crossing(NamedTuple):
+    """
+    A point where 2 wires cross
+
+    Properties:
+        x, y   (int*2): Point
+        steps1 (int)  : Steps taken along the 1st wire to reach it
+        steps2 (int)  : Steps taken along the 2nd wire to reach it
+    """
+
+    x: int
+    y: int
+    steps1: int
+    steps2: int
+
+    @property
+    def distance(self) -> int:
+        """
+        Manhattan distance from the origin
+        """
+        return abs(self.x) + abs(self.y)
+
+    @property
+    def delay(self) -> int:
+        """
+        Combined steps of both wires
+        """
+        return self.steps1 + self.steps2
+
+
+def iter_segments(path: Iterable[Tuple[str, int]]) -> Iterator[Segment]:
+    """
+    Turn the moves of a wire starting at the origin into segments, lazily
+
+    Args:
+        path (Iterable[tuple[str, int]]): Direction-stepcount pairs
+
+    Yields:
+        (Segment): Segments, in order; moves of 0 steps are skipped
+    """
+    x = y = steps = 0
+    for direction, count in path:
+        try:
+            dx, dy = DIRECTIONS[direction]
+        except KeyError:
+            raise ValueError(f"{direction=} unknown direction") from None
+        if count:
+            segment = Segment(x, y, x + dx * count, y + dy * count, steps)
+            yield segment
+            x, y, steps = segment.x1, segment.y1, steps + count
+
+
+def trace(path: Iterable[Tuple[str, int]]) -> List[Segment]:
+    """
+    Turn the moves of a wire starting at the origin into segments
+
+    Args:
+        path (Iterable[tuple[str, int]]): Direction-stepcount pairs
+
+    Returns:
+        (list[Segment]): Segments, in order; moves of 0 steps are skipped
+    """
+    return list(iter_segments(path))
+
+
+class _Fenwick:
+    """
+    Fenwick tree counting the active slots among a fixed number of them, so that
+      the k-th active slot is found in logarithmic time
+
+    Public Properties:
+        size (int): Number of slots
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._tree = [0] * (size + 1)
+        # Largest power of 2 not above the size, where `find` starts its descent
+        self._top = 1 << size.bit_length() >> 1
+
+    def add(self, slot: int, delta: int) -> None:
+        """
+        Change the count of a slot
+
+        Args:
+            slot  (int): 0-based slot
+            delta (int): Change of its count
+        """
+        tree = self._tree
+        slot += 1
+        while slot <= self.size:
+            tree[slot] += delta
+            slot += slot & -slot
+
+    def prefix(self, end: int) -> int:
+        """
+        Sum the counts of the slots before one
+
+        Args:
+            end (int): 0-based slot, excluded
+
+        Returns:
+            (int): Sum of the counts of slots 0 to `end` - 1
+        """
+        tree = self._tree
+        total = 0
+        while end > 0:
+            total += tree[end]
+            end -= end & -end
+        return total
+
+    def find(self, rank: int) -> int:
+        """
+        Find the slot where the prefix sum of the counts reaches a rank
+
+        Args:
+            rank (int): 1-based rank, at most the sum of all the counts
+
+        Returns:
+            (int): 0-based slot
+        """
+        tree = self._tree
+        slot = 0
+        step = self._top
+        while step:
+            if slot + step <= self.size and tree[slot + step] < rank:
+                slot += step
+                rank -= tree[slot]
+            step >>= 1
+        return slot
+
+
+def _perpendicular(
+    horizontals: Sequence[Segment], verticals: Sequence[Segment]
+) -> Iterator[Tuple[int, int, Segment, Segment]]:
+    """
+    Find where horizontal segments cross vertical ones, with a sweep line along x
+      keeping the horizontal segments it crosses by y
+    The y values are compressed into the slots of a Fenwick tree counting the lines
+      with active segments, so that each event takes logarithmic time, plus that of
+      the crossings found: O((n + k) log n) in all
+
+    Args:
+        horizontals (Sequence[Segment]): Horizontal segments
+        verticals   (Sequence[Segment]): Vertical segments
+
+    Yields:
+        (int, int)         : Crossing point
+        (Segment, Segment) : Horizontal and vertical segment crossing there
+    """
+    # (x, kind, index): horizontal segments start (0) before verticals are checked
+    #   (1), and end (2) after, so that touching ends count
+    events: List[Tuple[int, int, int]] = []
+    for index, segment in enumerate(horizontals):
+        events.append((min(segment.x0, segment.x1), 0, index))
+        events.append((max(segment.x0, segment.x1), 2, index))
+    for index, segment in enumerate(verticals):
+        events.append((segment.x0, 1, index))
+    events.sort()
+
+    lines = sorted({segment.y0 for segment in horizontals})
+    slots = {y: slot for slot, y in enumerate(lines)}
+    line_slots = [slots[segment.y0] for segment in horizontals]
+    # Lines with horizontal segments under the sweep line, and those segments
+    counts = _Fenwick(len(lines))
+    active: List[Set[int]] = [set() for _ in lines]
+    for x, kind, index in events:
+        if kind == 0:
+            slot = line_slots[index]
+            if not active[slot]:
+                counts.add(slot, 1)
+            active[slot].add(index)
+        elif kind == 2:
+            slot = line_slots[index]
+            active[slot].discard(index)
+            if not active[slot]:
+                counts.add(slot, -1)
+        else:
+            vertical = verticals[index]
+            low, high = sorted((vertical.y0, vertical.y1))
+            first = counts.prefix(bisect_left(lines, low))
+            last = counts.prefix(bisect_right(lines, high))
+            for rank in range(first + 1, last + 1):
+                slot = counts.find(rank)
+                for other in active[slot]:
+                    yield x, lines[slot], horizontals[other], vertical
+
+
+def _collinear(
+    segments1: Sequence[Segment], segments2: Sequence[Segment]
+) -> Iterator[Tuple[int, int, int, Segment, Segment]]:
+    """
+    Find where horizontal segments of 2 wires overlap along the same line
+
+    Args:
+        segments1 (Sequence[Segment]): Horizontal segments of the 1st wire
+        segments2 (Sequence[Segment]): Horizontal segments of the 2nd wire
+
+    Yields:
+        (int)              : y of the line
+        (int, int)         : Ends of the overlap along x
+        (Segment, Segment) : Overlapping segments of the 1st and 2nd wire
+    """
+    lines: DefaultDict[int, List[Tuple[int, int, int, Segment]]] = defaultdict(list)
+    for wire, segments in enumerate((segments1, segments2)):
+        for segment in segments:
+            low, high = sorted((segment.x0, segment.x1))
+            lines[segment.y0].append((low, high, wire, segment))
+    for y, intervals in lines.items():
+        intervals.sort(key=lambda interval: interval[:2])
+        # (high, order, segment) of the intervals of each wire that may still
+        #   overlap the next ones
+        open_intervals: Tuple[List[Tuple[int, int, Segment]], ...] = ([], [])
+        for order, (low, high, wire, segment) in enumerate(intervals):
+            others = open_intervals[1 - wire]
+            while others and others[0][0] < low:
+                heapq.heappop(others)
+            for other_high, _, other in others:
+                pair = (segment, other) if wire == 0 else (other, segment)
+                yield y, low, min(high, other_high), pair[0], pair[1]
+            heapq.heappush(open_intervals[wire], (high, order, segment))
+
+
+def _candidates(low: int, high: int) -> Set[int]:
+    """
+    Get the points of an overlap of 2 wires where the smallest distance or delay may
+      be: its ends and its point closest to the origin, and their neighbors inside
+      of it in case one of them is the origin itself
+
+    Args:
+        low, high (int*2): Ends of the overlap along the line
+
+    Returns:
+        (set[int]): Positions along the line
+    """
+    closest = min(max(0, low), high)
+    around = (low + 1, high - 1, closest - 1, closest + 1)
+    return {low, high, closest, *(along for along in around if low <= along <= high)}
+
+
+def crossings(wire1: Sequence[Segment], wire2: Sequence[Segment]) -> Iterator[Crossing]:
+    """
+    Find where 2 wires starting at the origin cross, other than there
+    Where the wires run along each other, only the few points of the overlap that may
+      be closest to the origin or have the smallest delay are reported, as the steps
+      of each wire change linearly along it (see `_candidates`). A point reached
+      several times is reported for each pair of visits
+
+    Args:
+        wire1 (Sequence[Segment]): Segments of the 1st wire
+        wire2 (Sequence[Segment]): Segments of the 2nd wire
+
+    Returns:
+        (Iterator[Crossing]): Crossings, in no particular order
+    """
+    horizontals1 = [segment for segment in wire1 if segment.horizontal]
+    horizontals2 = [segment for segment in wire2 if segment.horizontal]
+    verticals1 = [segment for segment in wire1 if not segment.horizontal]
+    verticals2 = [segment for segment in wire2 if not segment.horizontal]
+
+    found: List[Crossing] = []
+    for x, y, horizontal, vertical in _perpendicular(horizontals1, verticals2):
+        found.append(Crossing(x, y, horizontal.steps_to(x, y), vertical.steps_to(x, y)))
+    for x, y, horizontal, vertical in _perpendicular(horizontals2, verticals1):
+        found.append(Crossing(x, y, vertical.steps_to(x, y), horizontal.steps_to(x, y)))
+    for line, low, high, segment1, segment2 in _collinear(horizontals1, horizontals2):
+        for x in _candidates(low, high):
+            steps = (segment1.steps_to(x, line), segment2.steps_to(x, line))
+            found.append(Crossing(x, line, *steps))
+    # Vertical overlaps are found as horizontal ones across the x = y diagonal
+    for line, low, high, segment1, segment2 in _collinear(
+        [segment.transposed() for segment in verticals1],
+        [segment.transposed() for segment in verticals2],
+    ):
+        for y in _candidates(low, high):
+            steps = (segment1.steps_to(y, line), segment2.steps_to(y, line))
+            found.append(Crossing(line, y, *steps))
+
+    # The wires both start at the origin, which is not a crossing
+    return (crossing for crossing in found if crossing.steps1 and crossing.steps2)